@@ -1,11 +1,19 @@
 __version__ = "0.1.0"
 
-from .settings import configure_logging, set_billing_id, get_billing_id
+from .settings import (
+    configure_logging,
+    set_billing_id,
+    get_billing_id,
+    set_query_cache,
+    set_query_memo,
+)
 
 __all__ = [
     "configure_logging",
     "set_billing_id",
     "get_billing_id",
+    "set_query_cache",
+    "set_query_memo",
     "load_census",
     "load_rais",
     "load_cnes",
@@ -6,15 +6,62 @@ Orchestrates the loading of tabular data (BD/FTP) and spatial geometries
 """
 import pandas as pd
 import geopandas as gpd
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Union, Optional
 
-from atlasbr.core.catalog.census import get_census_spec
+from atlasbr.core.catalog.census import CensusThemeSpec, get_census_spec
 from atlasbr.infra.geo import resolver, tracts, footprint
 from atlasbr.core.geo import ops, h3 as h3_ops
 from atlasbr.core.logic import census as census_logic
 from atlasbr.settings import logger, resolve_billing_id
+from atlasbr.profiling import stage
 from atlasbr.core.types import PlaceInput
 
+# Upper bound on concurrent theme fetches (each one is a BQ query or download)
+_MAX_FETCH_WORKERS = 8
+
+# Urban tract IDs are pushed into the BigQuery filter up to this many codes
+# (beyond it the inline IN list would approach BigQuery's query size limit).
+MAX_TRACT_PUSHDOWN = 20_000
+
+
+def _fetch_theme(
+    spec: CensusThemeSpec,
+    muni_ids: List[int],
+    project_id: Optional[str],
+    tract_ids: Optional[List[int]] = None,
+) -> pd.DataFrame:
+    """Fetches one theme and applies its Logic layer (runs in a worker)."""
+    # A. Fetch Raw Data
+    if spec.strategy == "bd_table":
+        from atlasbr.infra.adapters import census_bd
+        df_raw = census_bd.fetch_census_bd(
+            spec, munis=muni_ids, billing_id=project_id, tract_ids=tract_ids
+        )
+    elif spec.strategy == "ftp_csv":
+        from atlasbr.infra.adapters import census_ftp
+        df_raw = census_ftp.fetch_census_ftp(spec, munis=muni_ids)
+    else:
+        raise NotImplementedError(
+            f"Strategy {spec.strategy} not implemented."
+        )
+
+    # B. Apply Logic (Transformation Layer)
+    # Use the public facade to standardize columns and types.
+    return census_logic.apply_census_logic(df_raw, spec)
+
+
+def _fetch_tracts(muni_ids: List[int], year: int) -> gpd.GeoDataFrame:
+    """Fetches and standardizes tract geometries (indexed by tract ID)."""
+    logger.info("    🗺️  Fetching Tract Geometries...")
+    # prepare_tracts only keeps the tract code and the geometry
+    with stage("fetch_tracts"):
+        raw_tracts = tracts.fetch_tracts_raw(
+            munis=muni_ids, year=year, columns=["code_tract"]
+        )
+    with stage("prepare_tracts"):
+        return ops.prepare_tracts(raw_tracts)
+
 
 def load_census(
     places: List[PlaceInput],
@@ -54,59 +101,87 @@ def load_census(
     project_id = (
         resolve_billing_id(gcp_billing) if strategy == "bd_table" else None
     )
-    muni_ids = resolver.resolve_places_to_ids(places)
+    with stage("resolve"):
+        muni_ids = resolver.resolve_places_to_ids(places)
 
     if not muni_ids:
         err_msg = f"Could not resolve any municipalities from: {places}"
         raise ValueError(err_msg)
 
-    # 2. Load and Normalize Data (Iterate themes)
-    merged_df = pd.DataFrame()
+    # 2. Urban Tracts First (optional)
+    # Clipping only keeps tracts inside the urban footprint, so it runs before
+    # the themes are fetched and the surviving tract IDs narrow the queries.
+    gdf_tracts = None
+    tract_ids = None
+    known_tracts = None  # every tract with a geometry, before clipping
+    if clip_urban:
+        gdf_tracts = _fetch_tracts(muni_ids, year)
+        known_tracts = gdf_tracts.index
+        logger.info("    ✂️  Clipping to Urban Area...")
+        with stage("urban_clip"):
+            urban_mask = footprint.fetch_urban_area_raw_gdf(year)
+
+            # Optimize: Create mask only for the ROI bounding box
+            local_mask = ops.create_urban_mask(
+                urban_mask, gdf_tracts.total_bounds, gdf_tracts.crs
+            )
+            gdf_tracts = ops.clip_to_mask(gdf_tracts, local_mask)
+
+        if strategy == "bd_table" and 0 < len(gdf_tracts) <= MAX_TRACT_PUSHDOWN:
+            tract_ids = gdf_tracts.index.tolist()
+
+    # 3. Load and Normalize Data
+    # Fetches are I/O bound (BigQuery / FTP), so all themes are requested
+    # concurrently. Merging stays on the main thread, in theme order.
+    frames: List[pd.DataFrame] = []
+    seen_cols: set = set()
     extensive_vars: List[str] = []
     intensive_vars: List[str] = []
 
-    for theme in themes:
-        spec = get_census_spec(year, theme, strategy)
-        logger.info(
-            f"    📦 Loading theme: '{theme}' via {strategy}..."
-        )
+    specs = [get_census_spec(year, theme, strategy) for theme in themes]
 
-        try:
-            # A. Fetch Raw Data
-            if spec.strategy == "bd_table":
-                from atlasbr.infra.adapters import census_bd
-                df_raw = census_bd.fetch_census_bd(
-                    spec, munis=muni_ids, billing_id=project_id
-                )
-            elif spec.strategy == "ftp_csv":
-                from atlasbr.infra.adapters import census_ftp
-                df_raw = census_ftp.fetch_census_ftp(spec, munis=muni_ids)
-            else:
-                raise NotImplementedError(
-                    f"Strategy {strategy} not implemented."
+    # One worker per theme (capped): no idle threads for small requests
+    workers = max(1, min(len(specs), _MAX_FETCH_WORKERS))
+    with stage("fetch_themes"), ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for spec in specs:
+            logger.info(
+                "    📦 Loading theme: '%s' via %s...", spec.theme, strategy
+            )
+            futures.append(
+                executor.submit(
+                    _fetch_theme, spec, muni_ids, project_id, tract_ids
                 )
+            )
 
-            # B. Apply Logic (Transformation Layer)
-            # Use the public facade to standardize columns and types.
-            df_clean = census_logic.apply_census_logic(df_raw, spec)
+        for spec, future in zip(specs, futures):
+            theme = spec.theme
+            try:
+                df_clean = future.result()
 
-            # C. Collect Metadata for Aggregation
-            if hasattr(spec, "extensive_vars"):
+                # C. Collect Metadata for Aggregation
+                # (always present on CensusThemeSpec, empty by default)
                 extensive_vars.extend(spec.extensive_vars)
-            if hasattr(spec, "intensive_vars"):
                 intensive_vars.extend(spec.intensive_vars)
 
-            # D. Merge
-            if merged_df.empty:
-                merged_df = df_clean
-            else:
-                merged_df = merged_df.join(
-                    df_clean, how="outer", rsuffix=f"_{theme}"
-                )
-
-        except Exception as e:
-            logger.error(f"Failed to load theme '{theme}': {e}")
-            raise
+                # D. Stage for Merge (suffix collisions like join's rsuffix)
+                df_clean = df_clean.loc[:, ~df_clean.columns.duplicated()]
+                clashes = seen_cols.intersection(df_clean.columns)
+                if clashes:
+                    df_clean = df_clean.rename(
+                        columns={c: f"{c}_{theme}" for c in clashes}
+                    )
+                seen_cols.update(df_clean.columns)
+                frames.append(df_clean)
+
+            except Exception as e:
+                logger.error("Failed to load theme '%s': %s", theme, e)
+                raise
+
+    # E. Merge all themes in a single outer alignment
+    merged_df = (
+        pd.concat(frames, axis=1, join="outer") if frames else pd.DataFrame()
+    )
 
     if merged_df.empty:
         raise RuntimeError("No census data found for requested criteria.")
@@ -119,12 +194,9 @@ def load_census(
     has_total = "habitantes" in merged_df.columns
 
     if has_partials and has_total:
-        adult_sum = (
-            merged_df["age_15_19"].fillna(0) +
-            merged_df["age_20_64"].fillna(0) +
-            merged_df["age_65p"].fillna(0)
+        residual = census_logic.clipped_residual(
+            merged_df["habitantes"], [merged_df[c] for c in age_cols]
         )
-        residual = (merged_df["habitantes"] - adult_sum).clip(lower=0)
 
         if "age_0_14" in merged_df.columns:
             merged_df["age_0_14"] = merged_df["age_0_14"].fillna(residual)
@@ -132,54 +204,48 @@ def load_census(
             merged_df["age_0_14"] = residual
     # ------------------------
 
-    # 3. Handle Geometry (Tracts)
-    logger.info("    🗺️  Fetching Tract Geometries...")
-
-    raw_tracts = tracts.fetch_tracts_raw(munis=muni_ids, year=year)
-    gdf_tracts = ops.prepare_tracts(raw_tracts)
-
-    # 4. Join Data + Geometry
-    initial_rows = len(merged_df)
-    gdf_data = gdf_tracts.join(merged_df, how="inner")
-    final_rows = len(gdf_data)
-
-    if final_rows == 0:
+    # 4. Handle Geometry (Tracts), unless already loaded for clipping
+    if gdf_tracts is None:
+        gdf_tracts = _fetch_tracts(muni_ids, year)
+
+    # 5. Join Data + Geometry
+    with stage("join"):
+        gdf_data = gdf_tracts.join(merged_df, how="inner")
+    # Rows outside the urban clip are expected to drop; only rows with no
+    # tract geometry at all count as mismatches.
+    if known_tracts is None:
+        matched_rows = len(gdf_data)
+    else:
+        matched_rows = int(merged_df.index.isin(known_tracts).sum())
+
+    if matched_rows == 0:
         raise RuntimeError(
             "Intersection of Census Data and Geometries is empty. "
             "Check if year/municipality codes align."
         )
 
-    if final_rows < initial_rows:
-        dropped = initial_rows - final_rows
+    if matched_rows < len(merged_df):
+        dropped = len(merged_df) - matched_rows
         logger.warning(
-            f"    ⚠️ Dropped {dropped} data rows due to missing "
+            "    ⚠️ Dropped %d data rows due to missing "
             "geometries. This is common if Malha is versioned "
-            "differently from Census data."
-        )
-
-    # 5. Optional: Urban Clipping
-    if clip_urban:
-        logger.info("    ✂️  Clipping to Urban Area...")
-        urban_mask = footprint.fetch_urban_area_raw_gdf(year)
-
-        # Optimize: Create mask only for the ROI bounding box
-        roi_bbox = gdf_data.total_bounds
-        local_mask = ops.create_urban_mask(
-            urban_mask, roi_bbox, gdf_data.crs
+            "differently from Census data.",
+            dropped,
         )
-        gdf_data = ops.clip_to_mask(gdf_data, local_mask)
 
     # 6. Spatial Aggregation (H3)
     if geometry == "h3":
-        logger.info(f"    ⬢ Aggregating to H3 resolution {h3_res}...")
+        logger.info("    ⬢ Aggregating to H3 resolution %s...", h3_res)
 
         # A. Create target hex grid
-        gdf_hex = h3_ops.h3fy(gdf_data, resolution=h3_res, clip=True)
+        with stage("h3fy"):
+            gdf_hex = h3_ops.h3fy(gdf_data, resolution=h3_res, clip=True)
 
         # B. Filter vars that actually exist in the dataframe
-        cols = merged_df.columns
-        valid_ext = [c for c in extensive_vars if c in cols]
-        valid_int = [c for c in intensive_vars if c in cols]
+        # (deduplicated: specs may repeat vars; set lookups on the columns)
+        cols = set(merged_df.columns)
+        valid_ext = [c for c in dict.fromkeys(extensive_vars) if c in cols]
+        valid_int = [c for c in dict.fromkeys(intensive_vars) if c in cols]
 
         if not valid_ext and not valid_int:
             logger.warning(
@@ -188,13 +254,14 @@ def load_census(
             )
 
         # C. Interpolate
-        interpolated = h3_ops.interpolate_area_weighted(
-            source_gdf=gdf_data,
-            target_gdf=gdf_hex,
-            extensive_vars=valid_ext,
-            intensive_vars=valid_int,
-            preserve_totals=True
-        )
+        with stage("interpolate_h3"):
+            interpolated = h3_ops.interpolate_area_weighted(
+                source_gdf=gdf_data,
+                target_gdf=gdf_hex,
+                extensive_vars=valid_ext,
+                intensive_vars=valid_int,
+                preserve_totals=True
+            )
 
         # Clean up geometry column if duplicated during join
         if "geometry" in interpolated.columns:
@@ -50,14 +50,14 @@ def load_cnes(
             billing_id=project_id
         )
         
-        logger.info(f"    🌍 Geocoding {len(df_cnes)} healthcare units via CEP...")
+        logger.info("    🌍 Geocoding %d healthcare units via CEP...", len(df_cnes))
         gdf_cnes = geocoding.geocode_by_cep(
             data_df=df_cnes,
             cep_df=df_ceps,
             data_cep_col="cep"
         )
-        logger.info(f"✅ Loaded {len(gdf_cnes)} CNES units (Geolocated).")
+        logger.info("✅ Loaded %d CNES units (Geolocated).", len(gdf_cnes))
         return gdf_cnes
     
-    logger.info(f"✅ Loaded {len(df_cnes)} CNES units (Tabular).")
+    logger.info("✅ Loaded %d CNES units (Tabular).", len(df_cnes))
     return df_cnes
\ No newline at end of file
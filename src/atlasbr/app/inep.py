@@ -42,14 +42,14 @@ def load_schools(
     
     # 5. Convert to GeoDataFrame
     if as_gdf:
-        logger.info(f"    🌍 Converting {len(df_schools)} schools to geometry...")
+        logger.info("    🌍 Converting %d schools to geometry...", len(df_schools))
         gdf_schools = geocoding.points_from_coords(
             df_schools, 
             lat_col="latitude", 
             lon_col="longitude"
         )
-        logger.info(f"✅ Loaded {len(gdf_schools)} schools.")
+        logger.info("✅ Loaded %d schools.", len(gdf_schools))
         return gdf_schools
     
-    logger.info(f"✅ Loaded {len(df_schools)} schools (Tabular).")
+    logger.info("✅ Loaded %d schools (Tabular).", len(df_schools))
     return df_schools
\ No newline at end of file
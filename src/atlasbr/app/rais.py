@@ -6,14 +6,30 @@ Handles the 'Hybrid Pipeline' which can inject public sector jobs
 """
 import pandas as pd
 import geopandas as gpd
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Union, Optional
 
 from atlasbr.core.catalog.rais import get_rais_spec
 from atlasbr.core.logic import geocoding, integration
 from atlasbr.infra.geo import resolver
 from atlasbr.settings import logger, resolve_billing_id
+from atlasbr.profiling import stage
 from atlasbr.core.types import PlaceInput
 
+
+def _result_or_empty(future: Optional[Future], label: str, year: int) -> pd.DataFrame:
+    """Unwraps an optional side-source fetch, falling back to an empty frame."""
+    if future is None:
+        return pd.DataFrame()
+    try:
+        return future.result()
+    except Exception as e:
+        logger.warning(
+            "Failed to load %s for %s: %s. Skipping injection.", label, year, e
+        )
+        return pd.DataFrame()
+
+
 def load_rais(
     places: List[PlaceInput],
     *,
@@ -39,72 +55,89 @@ def load_rais(
     project_id = resolve_billing_id(gcp_billing) if strategy == "bd_table" else None
 
     # 2. Resolve Inputs
-    muni_ids = resolver.resolve_places_to_ids(places)
+    with stage("resolve"):
+        muni_ids = resolver.resolve_places_to_ids(places)
     
     # 3. Get Spec (Strict Dispatch)
     # Raises ValueError if the strategy/year combination is invalid
     spec = get_rais_spec(year, strategy)
     
-    # 4. Fetch Main Data (RAIS)
-    if spec.strategy == "bd_table":
-        from atlasbr.infra.adapters import rais_bd
-        
-        logger.info(f"    🏭 Loading RAIS {year} via strategy '{strategy}'...")
-        main_dataset = rais_bd.fetch_rais_from_bd(
+    if spec.strategy != "bd_table":
+        raise NotImplementedError(
+            f"Strategy '{strategy}' is defined in catalog but not implemented in loader."
+        )
+
+    # 4. Fetch Sources
+    # RAIS, Schools, CNES and CEPs are independent BigQuery reads, so they
+    # are issued concurrently; harmonization and merging happen afterwards.
+    from atlasbr.infra.adapters import rais_bd
+
+    with stage("fetch_sources"), ThreadPoolExecutor(max_workers=4) as executor:
+        logger.info(
+            "    🏭 Loading RAIS %s via strategy '%s'...", year, strategy
+        )
+        rais_future = executor.submit(
+            rais_bd.fetch_rais_from_bd,
             table_id=spec.table_id,
             columns=spec.required_columns,
             munis=muni_ids,
             year=year,
-            billing_id=project_id
-        )
-    else:
-        raise NotImplementedError(
-            f"Strategy '{strategy}' is defined in catalog but not implemented in loader."
+            billing_id=project_id,
         )
 
-    # 5. Optional: Hybrid Public Sector Injection
-    if include_public_sector:
-        logger.info("    🧩 Injecting Public Sector data (Schools + Health)...")
-        
-        # A. Fetch Schools (INEP)
-        try:
+        schools_future = health_future = ceps_future = None
+        if include_public_sector:
             from atlasbr.app.inep import load_schools
-            schools = load_schools(
-                places=places,
-                year=year, # Assuming matching year exists
+            from atlasbr.app.cnes import load_cnes
+
+            logger.info("    🧩 Injecting Public Sector data (Schools + Health)...")
+            # Nested loaders get the resolved IDs: codes need no name lookup
+            # A. Schools (INEP)
+            schools_future = executor.submit(
+                load_schools,
+                places=muni_ids,
+                year=year,  # Assuming matching year exists
                 gcp_billing=project_id,
-                as_gdf=False
+                as_gdf=False,
             )
-        except Exception as e:
-            logger.warning(f"Failed to load Schools for {year}: {e}. Skipping injection.")
-            schools = pd.DataFrame()
-
-        # B. Fetch Health (CNES)
-        try:
-            from atlasbr.app.cnes import load_cnes
+            # B. Health (CNES)
             # CNES is monthly; we typically use September (09) as the reference
-            health = load_cnes(
-                places=places,
+            health_future = executor.submit(
+                load_cnes,
+                places=muni_ids,
                 year=year,
                 month=9,
-                gcp_billing=project_id, 
-                geocode=False
+                gcp_billing=project_id,
+                geocode=False,
             )
-        except Exception as e:
-            logger.warning(f"Failed to load CNES for {year}: {e}. Skipping injection.")
-            health = pd.DataFrame()
-        
+
+        if geocode:
+            from atlasbr.infra.adapters import ceps_bd
+            ceps_future = executor.submit(
+                ceps_bd.fetch_ceps_from_bd,
+                munis=muni_ids,
+                billing_id=project_id,
+            )
+
+        main_dataset = rais_future.result()
+        schools = _result_or_empty(schools_future, "Schools", year)
+        health = _result_or_empty(health_future, "CNES", year)
+        df_ceps = ceps_future.result() if ceps_future is not None else None
+
+    # 5. Optional: Hybrid Public Sector Injection
+    if include_public_sector:
         # C. Harmonize
-        # These functions align columns to RAIS standards (cnae_2, etc.)
-        schools_h = integration.harmonize_schools_to_rais(schools)
-        health_h = integration.harmonize_cnes_to_rais(health)
-        
-        # Standardize ID column names for the merge
-        if not schools_h.empty and "id_escola" in schools_h.columns:
-             schools_h = schools_h.rename(columns={"id_escola": "id_estab_original"})
-        
-        if not health_h.empty and "id_estabelecimento_cnes" in health_h.columns:
-             health_h = health_h.rename(columns={"id_estabelecimento_cnes": "id_estab_original"})
+        # These functions align columns to RAIS standards (cnae_2, etc.),
+        # including the source id -> 'id_estab_original' rename.
+        # Failed or empty side sources skip harmonization altogether.
+        schools_h = (
+            integration.harmonize_schools_to_rais(schools)
+            if not schools.empty else pd.DataFrame()
+        )
+        health_h = (
+            integration.harmonize_cnes_to_rais(health)
+            if not health.empty else pd.DataFrame()
+        )
 
         # D. Hybrid Merge
         to_merge = [main_dataset]
@@ -112,28 +145,39 @@ def load_rais(
         if not health_h.empty: to_merge.append(health_h)
         
         if len(to_merge) > 1:
-            main_dataset = pd.concat(to_merge, ignore_index=True)
+            # Align every frame to one prebuilt column list (and to the RAIS
+            # dtypes) so concat stacks matching blocks instead of re-deriving
+            # the union and upcasting per pair.
+            all_cols = list(dict.fromkeys(
+                col for frame in to_merge for col in frame.columns
+            ))
+            schema = main_dataset.dtypes
+            main_dataset = pd.concat(
+                [
+                    integration.conform_to_schema(frame, all_cols, schema)
+                    for frame in to_merge
+                ],
+                ignore_index=True,
+                sort=False,
+            )
             logger.info(
-                f"       -> Integrated {len(schools_h)} schools and {len(health_h)} health units."
+                "       -> Integrated %d schools and %d health units.",
+                len(schools_h), len(health_h),
             )
 
     # 6. Optional: Geocoding
     if geocode:
-        from atlasbr.infra.adapters import ceps_bd
-        
-        df_ceps = ceps_bd.fetch_ceps_from_bd(
-            munis=muni_ids,
-            billing_id=resolve_billing_id(gcp_billing)
-        )
-        
-        logger.info(f"    🌍 Geocoding {len(main_dataset)} establishments via CEP...")
-        gdf_rais = geocoding.geocode_by_cep(
-            data_df=main_dataset,
-            cep_df=df_ceps,
-            data_cep_col="cep"
+        logger.info(
+            "    🌍 Geocoding %d establishments via CEP...", len(main_dataset)
         )
-        logger.info(f"✅ Loaded {len(gdf_rais)} establishments (Geolocated).")
+        with stage("geocode"):
+            gdf_rais = geocoding.geocode_by_cep(
+                data_df=main_dataset,
+                cep_df=df_ceps,
+                data_cep_col="cep"
+            )
+        logger.info("✅ Loaded %d establishments (Geolocated).", len(gdf_rais))
         return gdf_rais
     
-    logger.info(f"✅ Loaded {len(main_dataset)} establishments (Tabular).")
+    logger.info("✅ Loaded %d establishments (Tabular).", len(main_dataset))
     return main_dataset
\ No newline at end of file
@@ -125,7 +125,8 @@ class CensusThemeSpec(BaseModel):
 # Catalog Registry
 # ---------------------------------------------------------------------
 
-CENSUS_CATALOG: List[CensusThemeSpec] = [
+# A tuple: _CATALOG_INDEX below is built from it once, at import
+CENSUS_CATALOG: Tuple[CensusThemeSpec, ...] = (
 
     # ==========================================
     # 2010 CENSUS
@@ -376,18 +377,26 @@ CENSUS_CATALOG: List[CensusThemeSpec] = [
         # Canonical outputs
         extensive_vars=["age_0_14", "age_15_19", "age_20_64", "age_65p"],
     ),
-]
+)
 
 # ---------------------------------------------------------------------
 # Lookup Logic
 # ---------------------------------------------------------------------
 
-_CATALOG_INDEX: Dict[
-    Tuple[str, int, CensusStrategy], CensusThemeSpec
-] = {
-    (spec.theme, spec.year, spec.strategy): spec
-    for spec in CENSUS_CATALOG
-}
+def _build_index(
+    catalog: Tuple[CensusThemeSpec, ...]
+) -> Dict[Tuple[str, int, CensusStrategy], CensusThemeSpec]:
+    """(theme, year, strategy) -> spec; a repeated key is a catalog error."""
+    index: Dict[Tuple[str, int, CensusStrategy], CensusThemeSpec] = {}
+    for spec in catalog:
+        key = (spec.theme, spec.year, spec.strategy)
+        if key in index:
+            raise ValueError(f"Duplicate Census catalog entry for {key}.")
+        index[key] = spec
+    return index
+
+
+_CATALOG_INDEX = _build_index(CENSUS_CATALOG)
 
 
 def get_census_spec(year: int, theme: str, strategy: str) -> CensusThemeSpec:
@@ -1,9 +1,9 @@
 from .ops import prepare_tracts, create_urban_mask, clip_to_mask
-from .h3 import h3fy, interpolate_area_weighted 
+from .h3 import h3fy, interpolate_area_weighted, area_overlap_matrix
 from .utils import to_local_utm, clean_geometries
 
 __all__ = [
     "prepare_tracts", "create_urban_mask", "clip_to_mask",
-    "h3fy", "interpolate_area_weighted", 
+    "h3fy", "interpolate_area_weighted", "area_overlap_matrix",
     "to_local_utm", "clean_geometries"
 ]
\ No newline at end of file
@@ -2,8 +2,12 @@
 AtlasBR - Core Geo Spatial Logic (H3 & Interpolation).
 
 Provides robust H3 grid generation (adapting to library versions) and
-areal interpolation wrappers using Tobler.
+sparse-matrix areal interpolation.
 """
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 import geopandas as gpd
 import shapely
@@ -17,6 +21,9 @@ from atlasbr.settings import logger
 # Check GeoPandas version for union operations
 GPD_10 = Version(gpd.__version__) >= Version("1.0.0dev")
 
+# Sources above this many rows build the overlap table in parallel chunks
+OVERLAP_CHUNK_SIZE = 5_000
+
 def _require_h3() -> Any:
     """Lazy loader for H3."""
     try:
@@ -28,14 +35,14 @@ def _require_h3() -> Any:
             "Please install it via `pip install atlasbr[geo]`."
         )
 
-def _require_tobler() -> Any:
-    """Lazy loader for Tobler."""
+def _require_sparse() -> Any:
+    """Lazy loader for SciPy sparse matrices."""
     try:
-        from tobler.area_weighted import area_interpolate
-        return area_interpolate
+        from scipy import sparse
+        return sparse
     except ImportError:
         raise ImportError(
-            "The 'tobler' library is required for areal interpolation. "
+            "The 'scipy' library is required for areal interpolation. "
             "Please install it via `pip install atlasbr[geo]`."
         )
 
@@ -136,7 +143,7 @@ def h3fy(
     _require_h3()
 
     orig_crs = source.crs
-    clipper = source.copy()
+    clipper = source  # never mutated; reprojection returns new frames
 
     # 1. Project to Lat/Lon (EPSG:4326) required for H3
     if source.crs.is_geographic:
@@ -195,7 +202,9 @@ def h3fy(
 
     # 4. Post-processing (Clip & Reproject)
     if return_geoms and clip:
-        clipper_4326 = clipper.to_crs(4326)
+        # Unbuffered, `source` already is the clipper in EPSG:4326: reuse it
+        # instead of pushing every tract vertex through PROJ a second time.
+        clipper_4326 = source if not buffer else clipper.to_crs(4326)
         hexagons = gpd.clip(hexagons, clipper_4326)
 
     if return_geoms and not hexagons.crs.equals(orig_crs):
@@ -203,16 +212,78 @@ def h3fy(
 
     return hexagons
 
+def _overlap_pairs(
+    src_geoms: np.ndarray,
+    tgt_geoms: np.ndarray,
+    tree: shapely.STRtree,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Intersecting (source, target) pairs and their intersection areas."""
+    ids_src, ids_tgt = tree.query(src_geoms, predicate="intersects")
+    areas = shapely.area(
+        shapely.intersection(src_geoms[ids_src], tgt_geoms[ids_tgt])
+    )
+    return ids_src, ids_tgt, areas
+
+def area_overlap_matrix(
+    source_gdf: gpd.GeoDataFrame,
+    target_gdf: gpd.GeoDataFrame
+) -> Any:
+    """
+    Builds the sparse (n_source x n_target) matrix of intersection areas.
+
+    Candidate pairs come from bulk STRtree queries on the target index and
+    their areas from vectorized intersections. Large sources are split into
+    contiguous chunks processed on worker threads (GEOS releases the GIL);
+    the pairs are disjoint per chunk, so the matrix is identical.
+    """
+    sparse = _require_sparse()
+
+    src_geoms = np.asarray(source_gdf.geometry.array)
+    tgt_geoms = np.asarray(target_gdf.geometry.array)
+    # Built once on this thread; queries on it are read-only
+    tree = shapely.STRtree(tgt_geoms)
+
+    n_chunks = -(-len(src_geoms) // OVERLAP_CHUNK_SIZE)
+    if n_chunks <= 1:
+        ids_src, ids_tgt, areas = _overlap_pairs(src_geoms, tgt_geoms, tree)
+    else:
+        starts = range(0, len(src_geoms), OVERLAP_CHUNK_SIZE)
+
+        def _chunk(start: int):
+            ids_src, ids_tgt, areas = _overlap_pairs(
+                src_geoms[start:start + OVERLAP_CHUNK_SIZE], tgt_geoms, tree
+            )
+            return ids_src + start, ids_tgt, areas
+
+        workers = min(os.cpu_count() or 1, n_chunks)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_chunk, starts))
+        ids_src, ids_tgt, areas = (np.concatenate(p) for p in zip(*parts))
+
+    return sparse.coo_matrix(
+        (areas, (ids_src, ids_tgt)),
+        shape=(len(src_geoms), len(tgt_geoms)),
+    ).tocsr()
+
+def _finite_values(gdf: gpd.GeoDataFrame, columns: List[str]) -> np.ndarray:
+    """Column block as float64, with NaN/inf treated as 0 (as in Tobler)."""
+    values = gdf[columns].to_numpy(dtype=np.float64)
+    return np.where(np.isfinite(values), values, 0.0)
+
 def interpolate_area_weighted(
     source_gdf: gpd.GeoDataFrame,
     target_gdf: gpd.GeoDataFrame,
     extensive_vars: Optional[List[str]] = None,
     intensive_vars: Optional[List[str]] = None,
-    preserve_totals: bool = True
+    preserve_totals: bool = True,
+    overlap: Optional[Any] = None,
 ) -> gpd.GeoDataFrame:
     """
     Transfers attributes from Source (Tracts) to Target (H3) using areal weighting.
-    Wrapper around `tobler.area_weighted.area_interpolate`.
+
+    Same semantics as `tobler.area_weighted.area_interpolate`, but the overlap
+    table is built once and every variable is moved with a single sparse
+    matrix product instead of one pass per column.
 
     Args:
         source_gdf: Source geometries (e.g. Tracts).
@@ -220,8 +291,11 @@ def interpolate_area_weighted(
         extensive_vars: Variables to sum (e.g. population, households).
         intensive_vars: Variables to average (e.g. income, density).
         preserve_totals: If True, ensures the sum of extensive vars is preserved (allocate_total=True).
+        overlap: Optional precomputed `area_overlap_matrix(source_gdf, target_gdf)`
+            (same row order, target CRS). Interpolating several themes or years
+            over the same geometries then pays for the intersections only once.
     """
-    area_interpolate = _require_tobler()
+    _require_sparse()  # fail fast, before any reprojection
 
     if extensive_vars is None: extensive_vars = []
     if intensive_vars is None: intensive_vars = []
@@ -231,10 +305,40 @@ def interpolate_area_weighted(
         logger.info("    ⚠️ Reprojecting source to match target CRS for interpolation...")
         source_gdf = source_gdf.to_crs(target_gdf.crs)
 
-    return area_interpolate(
-        source_df=source_gdf,
-        target_df=target_gdf,
-        extensive_variables=extensive_vars,
-        intensive_variables=intensive_vars,
-        allocate_total=preserve_totals 
-    )
\ No newline at end of file
+    if overlap is None:
+        table = area_overlap_matrix(source_gdf, target_gdf)
+    elif overlap.shape != (len(source_gdf), len(target_gdf)):
+        raise ValueError(
+            f"Overlap matrix shape {overlap.shape} does not match "
+            f"{len(source_gdf)} sources x {len(target_gdf)} targets."
+        )
+    else:
+        table = overlap.tocsr()
+    # The normalizations are applied to the dense value blocks, so each kind
+    # of variable costs one sparse pass and no scaled weight matrix is built.
+    table_t = table.T
+    blocks = []
+
+    # 1. Extensive: split each source value by its share of area
+    if extensive_vars:
+        if preserve_totals:
+            den = np.asarray(table.sum(axis=1)).ravel()
+        else:
+            den = source_gdf.area.to_numpy()
+        den = den + (den == 0)
+        shares = _finite_values(source_gdf, extensive_vars) / den[:, None]
+        values = table_t @ shares
+        blocks.append(pd.DataFrame(values, columns=extensive_vars))
+
+    # 2. Intensive: area-weighted average over each target
+    if intensive_vars:
+        area = np.asarray(table.sum(axis=0)).ravel()
+        values = table_t @ _finite_values(source_gdf, intensive_vars)
+        values /= (area + (area == 0))[:, None]
+        blocks.append(pd.DataFrame(values, columns=intensive_vars))
+
+    df = pd.concat(blocks, axis=1) if blocks else pd.DataFrame(index=range(len(target_gdf)))
+    df = df.replace(np.inf, np.nan)
+    df.index = target_gdf.index
+
+    return gpd.GeoDataFrame(df, geometry=target_gdf.geometry, crs=target_gdf.crs)
@@ -1,8 +1,80 @@
 """
 AtlasBR - Core Geo Logic (Masks).
 """
+import numpy as np
+import shapely
 import geopandas as gpd
 
+_GEOMETRYCOLLECTION = 7
+
+
+def _keep_source_dimension(clipped: np.ndarray, source_dims: np.ndarray) -> np.ndarray:
+    """
+    Drops intersection by-products of a lower dimension (e.g. the shared edge
+    of two touching polygons), mirroring `gpd.clip(keep_geom_type=True)`.
+    """
+    is_collection = shapely.get_type_id(clipped) == _GEOMETRYCOLLECTION
+    for i in np.flatnonzero(is_collection):
+        parts = shapely.get_parts(clipped[i])
+        parts = parts[shapely.get_dimensions(parts) == source_dims[i]]
+        clipped[i] = shapely.union_all(parts)
+    return clipped
+
+
+def _clip_pairwise(geoms: np.ndarray, mask_geoms: np.ndarray):
+    """Clips against a multi-part mask via bulk STRtree pairs."""
+    # 1. Candidate pairs (input position, mask position)
+    tree = shapely.STRtree(mask_geoms)
+    left, right = tree.query(geoms, predicate="intersects")
+
+    # 2. Vectorized intersection
+    clipped = shapely.intersection(geoms[left], mask_geoms[right])
+
+    # 3. Rows hitting several mask parts are re-assembled into one geometry
+    positions, inverse = np.unique(left, return_inverse=True)
+    if len(positions) < len(left):
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.flatnonzero(np.diff(inverse[order])) + 1
+        clipped = np.array(
+            [shapely.union_all(g) for g in np.split(clipped[order], bounds)],
+            dtype=object,
+        )
+    return positions, clipped
+
+
 def clip_to_mask(gdf: gpd.GeoDataFrame, mask: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-    """Pure logic: clips geometries to a mask."""
-    return gpd.overlay(gdf, mask, how="intersection")
\ No newline at end of file
+    """
+    Pure logic: clips geometries to a mask.
+
+    Candidate pairs come from a single bulk STRtree query and are intersected
+    in one vectorized GEOS call. Rows outside the mask are dropped; index
+    and attributes of the surviving rows are preserved.
+    """
+    geoms = np.asarray(gdf.geometry.array)
+    mask_geoms = np.asarray(mask.geometry.array)
+
+    if len(mask_geoms) == 1:
+        # Fast path: dissolved mask (e.g. urban footprint). The input's own
+        # spatial index prefilters, and the intersection is a broadcast.
+        mask_geom = mask_geoms[0]
+        shapely.prepare(mask_geom)  # no-op if create_urban_mask already did
+        positions = np.sort(gdf.sindex.query(mask_geom, predicate="intersects"))
+
+        # Rows strictly inside the mask are kept as-is; only the boundary
+        # rows pay for an intersection.
+        clipped = geoms[positions].copy()
+        crossing = ~shapely.contains_properly(mask_geom, clipped)
+        clipped[crossing] = shapely.intersection(clipped[crossing], mask_geom)
+    else:
+        positions, clipped = _clip_pairwise(geoms, mask_geoms)
+
+    # Keep geometry type and drop empties
+    source_dims = shapely.get_dimensions(geoms[positions])
+    clipped = _keep_source_dimension(clipped, source_dims)
+    keep = ~shapely.is_empty(clipped) & (
+        shapely.get_dimensions(clipped) == source_dims
+    )
+
+    out = gdf.iloc[positions[keep]].copy()
+    out.geometry = gpd.GeoSeries(clipped[keep], index=out.index, crs=gdf.crs)
+    return out
@@ -1,16 +1,31 @@
 """
 AtlasBR - Core Geo Operations (Clipping & Masking).
 """
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
+from pyproj import Transformer
 from typing import Tuple, Union, Any
+from atlasbr.core.geo import masks
 from atlasbr.core.geo.utils import to_local_utm, clean_geometries
+from atlasbr.core.logic.census import normalize_tract_ids
 from atlasbr.settings import logger
 
+# Inputs above this many rows are clipped in parallel chunks
+CLIP_CHUNK_SIZE = 10_000
+
+# Slack for the reprojected ROI bbox (fraction of its extent); the exact
+# bbox test in the target CRS follows, so this only needs to be generous.
+URBAN_BBOX_MARGIN = 0.05
+
 def prepare_tracts(raw_tracts: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """
     Standardizes raw tract data:
-    1. Standardizes ID column (zfill 15).
+    1. Standardizes ID column (int64 tract codes).
     2. Projects to UTM.
     3. Cleans invalid geometries.
     """
@@ -18,13 +33,10 @@ def prepare_tracts(raw_tracts: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     
     # Standardize ID
     if "code_tract" in gdf.columns:
-        # Removes .0 suffix if present (common in int->float->str conversions)
-        gdf["id_setor_censitario"] = (
-            gdf["code_tract"]
-            .astype(str)
-            .str.replace(r'\.0$', '', regex=True)
-            .str.zfill(15)
-        )
+        ids = normalize_tract_ids(gdf["code_tract"])
+        if len(ids) < len(gdf):
+            gdf = gdf.loc[ids.index]  # rows without a usable code
+        gdf["id_setor_censitario"] = ids
     
     # Project & Clean
     gdf = to_local_utm(gdf)
@@ -36,6 +48,14 @@ def prepare_tracts(raw_tracts: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     
     return gdf[["geometry"]]
 
+def _expand_bounds(
+    bounds: Tuple[float, float, float, float], margin: float
+) -> Tuple[float, float, float, float]:
+    """Grows a bounding box by a fraction of its size on every side."""
+    minx, miny, maxx, maxy = bounds
+    dx, dy = (maxx - minx) * margin, (maxy - miny) * margin
+    return (minx - dx, miny - dy, maxx + dx, maxy + dy)
+
 def create_urban_mask(
     urban_gdf: gpd.GeoDataFrame,
     bbox: Tuple[float, float, float, float],
@@ -44,31 +64,49 @@ def create_urban_mask(
     """
     Creates a single dissolved polygon mask from the raw national urban file.
     """
-    # 1. Project to target CRS (usually UTM) if needed
+    # 1. Project to target CRS (usually UTM) if needed.
+    # Only polygons near the ROI are reprojected: the bbox is taken to the
+    # layer's native CRS and prefilters the national file through its index.
     if not urban_gdf.crs.equals(target_crs):
-        urban_gdf = urban_gdf.to_crs(target_crs)
+        native_bbox = _expand_bounds(
+            Transformer.from_crs(
+                target_crs, urban_gdf.crs, always_xy=True
+            ).transform_bounds(*bbox, densify_pts=21),
+            URBAN_BBOX_MARGIN,
+        )
+        near = urban_gdf.sindex.query(
+            shapely.box(*native_bbox), predicate="intersects"
+        )
+        urban_gdf = urban_gdf.iloc[np.sort(near)].to_crs(target_crs)
 
-    # 2. Filter by Bounding Box (Spatial Index)
-    minx, miny, maxx, maxy = bbox
-    urban_slice = urban_gdf.cx[minx:maxx, miny:maxy]
+    # 2. Filter by Bounding Box (Spatial Index, single bulk query)
+    hits = urban_gdf.sindex.query(shapely.box(*bbox), predicate="intersects")
+    urban_slice = urban_gdf.iloc[hits]
 
     if urban_slice.empty:
         logger.warning("    ⚠️ Urban mask slice is empty. Returning empty mask.")
         return gpd.GeoDataFrame({"geometry": []}, crs=target_crs)
 
     # 3. Dissolve and Buffer
-    union_geom = urban_slice.unary_union
+    # Snapping to a 1 m grid (target CRS is metric) makes the overlay both
+    # faster and more robust; the 500 m buffer dwarfs the precision loss.
+    union_geom = shapely.union_all(
+        np.asarray(urban_slice.geometry.array), grid_size=1.0
+    )
     
     if union_geom.is_empty:
          return gpd.GeoDataFrame({"geometry": []}, crs=target_crs)
 
-    buffered_geom = union_geom.buffer(500)
+    buffered_geom = shapely.buffer(union_geom, 500)
+    # Precompute GEOS indices; the mask is tested against every tract
+    shapely.prepare(buffered_geom)
 
     return gpd.GeoDataFrame({"geometry": [buffered_geom]}, crs=target_crs)
 
 def clip_to_mask(gdf: gpd.GeoDataFrame, mask: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """
     Clips the input GDF to the mask polygon.
+    Large inputs are clipped in chunks on worker threads (GEOS releases the GIL).
     """
     if mask.empty:
         return gdf.iloc[0:0] 
@@ -76,4 +114,25 @@ def clip_to_mask(gdf: gpd.GeoDataFrame, mask: gpd.GeoDataFrame) -> gpd.GeoDataFr
     if not mask.crs.equals(gdf.crs):
         mask = mask.to_crs(gdf.crs)
 
-    return gpd.clip(gdf, mask, keep_geom_type=True)
\ No newline at end of file
+    if len(gdf) <= CLIP_CHUNK_SIZE:
+        return masks.clip_to_mask(gdf, mask)
+
+    # Tracts arrive grouped by municipality, so contiguous chunks keep
+    # each worker's STRtree local and its GEOS heap small.
+    n_chunks = -(-len(gdf) // CLIP_CHUNK_SIZE)
+    chunks = np.array_split(np.arange(len(gdf)), n_chunks)
+    mask_wkb = shapely.to_wkb(np.asarray(mask.geometry.array))
+
+    def _clip_chunk(positions: np.ndarray) -> gpd.GeoDataFrame:
+        # Prepared geometries must not be shared across threads,
+        # so every worker clips against its own copy of the mask.
+        own_mask = gpd.GeoDataFrame(
+            geometry=shapely.from_wkb(mask_wkb), crs=mask.crs
+        )
+        return masks.clip_to_mask(gdf.iloc[positions], own_mask)
+
+    workers = min(os.cpu_count() or 1, n_chunks)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        parts = list(executor.map(_clip_chunk, chunks))
+
+    return pd.concat(parts)
\ No newline at end of file
@@ -1,6 +1,8 @@
 """
 AtlasBR - Core Geo Utilities.
 """
+import numpy as np
+import shapely
 import geopandas as gpd
 
 def to_local_utm(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
@@ -14,18 +16,26 @@ def to_local_utm(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
 
 def clean_geometries(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """
-    Fixes invalid geometries using buffer(0).
+    Fixes invalid geometries using buffer(0) and drops null/empty ones.
     Only applies fix to geometries marked as invalid to save time.
     """
     if gdf.empty:
         return gdf
 
-    # Identify invalid geometries
-    invalid_mask = ~gdf.is_valid
-    
-    if invalid_mask.any():
+    # Single GEOS pass over the raw geometry array (no GeoSeries wrappers)
+    geoms = np.asarray(gdf.geometry.array)
+    invalid = ~shapely.is_valid(geoms) & ~shapely.is_missing(geoms)
+
+    if invalid.any():
         # Apply buffer(0) only to invalid rows
-        # We copy to avoid SettingWithCopy warnings if slice
-        gdf.loc[invalid_mask, "geometry"] = gdf.loc[invalid_mask, "geometry"].buffer(0)
-    
-    return gdf
\ No newline at end of file
+        geoms = geoms.copy()
+        geoms[invalid] = shapely.buffer(geoms[invalid], 0)
+        gdf = gdf.set_geometry(
+            gpd.GeoSeries(geoms, index=gdf.index, crs=gdf.crs)
+        )
+
+    keep = ~(shapely.is_missing(geoms) | shapely.is_empty(geoms))
+    if not keep.all():
+        gdf = gdf.iloc[keep]
+
+    return gdf
@@ -8,7 +8,12 @@ It is strategy-aware: handles raw BigQuery columns differently from FTP CSVs.
 
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Callable, Any
+import pyarrow as pa
+import pyarrow.compute as pc
+from types import MappingProxyType
+from typing import List, Dict, Callable, Any, Mapping, Optional, Tuple
+
+from atlasbr.settings import logger
 
 # --- Constants ---
 
@@ -17,6 +22,42 @@ CENSO_RACES = ("branca", "preta", "amarela", "parda", "indigena")
 # --- Helpers ---
 
 
+def normalize_tract_ids(ids: pd.Series) -> pd.Series:
+    """
+    Casts tract codes (str, float or int) to int64 join keys.
+
+    The 15-digit IBGE code fits in int64, and joining tracts to attributes
+    on integers avoids hashing Python strings on every merge.
+    Missing or malformed codes cannot be joined; those rows are dropped
+    (with a warning), so callers align on the returned index.
+    """
+    if pd.api.types.is_integer_dtype(ids) and not ids.hasnans:
+        return ids.astype("int64")
+
+    if pd.api.types.is_numeric_dtype(ids):
+        parsed = ids
+    else:
+        # Plain digit strings (the common case) parse in a single Arrow kernel
+        try:
+            arr = pc.cast(pc.utf8_trim_whitespace(pa.array(ids)), pa.int64())
+            if arr.null_count == 0:
+                return pd.Series(arr.to_numpy(), index=ids.index, name=ids.name)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+
+        # Mixed inputs (floats rendered as '123.0', objects, blanks, ...)
+        parsed = pd.to_numeric(ids.astype(str).str.strip(), errors="coerce")
+
+    invalid = parsed.isna()
+    if invalid.any():
+        logger.warning(
+            "    ⚠️ Dropped %d rows with missing or malformed tract codes.",
+            int(invalid.sum()),
+        )
+        parsed = parsed[~invalid]
+    return parsed.astype("int64")
+
+
 def _sum_cols(
     df: pd.DataFrame,
     pattern: str = "v",
@@ -29,29 +70,79 @@ def _sum_cols(
     Sums a range of columns (e.g., v035 to v048).
     Handles missing columns gracefully by ignoring them (assuming 0).
     """
-    cols = [f"{pattern}{i:0{width}d}" for i in range(start, end, step)]
-    # Only select columns that actually exist in the fetched dataframe
-    valid_cols = [c for c in cols if c in df.columns]
-
-    if not valid_cols:
-        return pd.Series(0, index=df.index)
+    # Reduced on a NumPy block (no DataFrame slice), see `_sum_col_groups`
+    sums = _sum_col_groups(
+        df, {"sum": range(start, end, step)}, pattern=pattern, width=width
+    )
+    return sums["sum"].rename(None)
 
-    return df[valid_cols].sum(axis=1)
-
-# --- 2010 Transformers ---
+def _sum_col_groups(
+    df: pd.DataFrame,
+    groups: Dict[str, range],
+    pattern: str = "v",
+    width: int = 3,
+) -> pd.DataFrame:
+    """
+    Sums several column ranges (one output column per group) at once.
+    The needed columns are extracted into a single NumPy block and each group
+    is reduced from it, instead of building one sub-frame per `_sum_cols`.
+    Missing columns are ignored (assumed 0), as in `_sum_cols`.
+    """
+    group_cols = {
+        name: [f"{pattern}{i:0{width}d}" for i in idx]
+        for name, idx in groups.items()
+    }
+    needed = [
+        c for c in dict.fromkeys(c for cols in group_cols.values() for c in cols)
+        if c in df.columns
+    ]
+    position = {c: i for i, c in enumerate(needed)}
+
+    if not needed:
+        block = np.zeros((len(df), 0), dtype=np.int64)
+    else:
+        block = df[needed].to_numpy()
+        if block.dtype == object:
+            # Nullable columns with NA come out as objects
+            block = df[needed].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    return pd.DataFrame(
+        {
+            name: np.nansum(
+                block[:, [position[c] for c in cols if c in position]], axis=1
+            )
+            for name, cols in group_cols.items()
+        },
+        index=df.index,
+    )
+
+def clipped_residual(total: pd.Series, parts: List[Any]) -> pd.Series:
+    """
+    Computes `total - sum(parts)` floored at 0, subtracting in place into a
+    single output buffer. Missing (NaN) parts count as 0; a missing total
+    stays missing. Parts may be Series aligned with `total` or scalars.
+    Nullable (masked or Arrow) inputs keep their dtype: they go through
+    pandas arithmetic instead of the NumPy buffer.
+    """
+    is_ext = pd.api.types.is_extension_array_dtype
+    if is_ext(total) or any(is_ext(p) for p in parts):
+        rest = sum(p.fillna(0) if isinstance(p, pd.Series) else p for p in parts)
+        return (total - rest).clip(lower=0)
 
+    arrays = [np.asarray(p) for p in parts]
+    base = total.to_numpy()
+    out = base.astype(np.result_type(base, *arrays), copy=True)
 
-def _handle_basic_2010(df: pd.DataFrame, strategy: str) -> pd.DataFrame:
-    """Renames basic variables to canonical names."""
-    return df.rename(columns={
-        "v002": "habitantes",
-        "v001": "domicilios"
-    })
+    for arr in arrays:
+        if arr.dtype.kind == "f":
+            np.subtract(out, arr, out=out, where=~np.isnan(arr))
+        else:
+            np.subtract(out, arr, out=out)
+    np.maximum(out, 0, out=out)
 
+    return pd.Series(out, index=total.index)
 
-def _handle_income_2010(df: pd.DataFrame, strategy: str) -> pd.DataFrame:
-    """Renames income variables."""
-    return df.rename(columns={"v009": "rendimento_medio"})
+# --- 2010 Transformers ---
 
 
 def _handle_age_2010(df: pd.DataFrame, strategy: str) -> pd.DataFrame:
@@ -62,44 +153,25 @@ def _handle_age_2010(df: pd.DataFrame, strategy: str) -> pd.DataFrame:
 
     # Calculate brackets
     # 0-14: v022 (Total <1y) + range(35, 49)
-    df["age_0_14"] = df.get("v022", 0) + _sum_cols(df, "v", 35, 49, width=3)
-
-    df["age_15_19"] = _sum_cols(df, "v", 49, 54, width=3)
-    df["age_20_64"] = _sum_cols(df, "v", 54, 99, width=3)
-    df["age_65p"] = _sum_cols(df, "v", 99, 135, width=3)
-
-    return df[["age_0_14", "age_15_19", "age_20_64", "age_65p"]]
+    brackets = _sum_col_groups(
+        df,
+        {
+            "age_0_14": range(35, 49),
+            "age_15_19": range(49, 54),
+            "age_20_64": range(54, 99),
+            "age_65p": range(99, 135),
+        },
+        pattern="v",
+        width=3,
+    )
+    brackets["age_0_14"] = df.get("v022", 0) + brackets["age_0_14"]
 
+    return brackets
 
-def _handle_race_2010(df: pd.DataFrame, strategy: str) -> pd.DataFrame:
-    """Renames race columns for 2010."""
-    mapping = {
-        "v002": "cor_branca",
-        "v003": "cor_preta",
-        "v004": "cor_amarela",
-        "v005": "cor_parda",
-        "v006": "cor_indigena"
-    }
-    df = df.rename(columns=mapping)
-    # Return only the canonical columns if they exist
-    cols = [c for c in mapping.values() if c in df.columns]
-    return df[cols]
 
 # --- 2022 Transformers ---
 
 
-def _handle_basic_2022(df: pd.DataFrame, strategy: str) -> pd.DataFrame:
-    if strategy == "bd_table":
-        return df.rename(columns={"pessoas": "habitantes"})
-    # FTP already mapped via Catalog
-    return df
-
-
-def _handle_income_2022(df: pd.DataFrame, strategy: str) -> pd.DataFrame:
-    # FTP already mapped to 'rendimento_medio'
-    return df
-
-
 def _handle_age_2022(df: pd.DataFrame, strategy: str) -> pd.DataFrame:
     """
     Aggregates raw 2022 age columns.
@@ -114,9 +186,15 @@ def _handle_age_2022(df: pd.DataFrame, strategy: str) -> pd.DataFrame:
     if strategy == "bd_table":
         # Base dos Dados (Preliminar Table)
         # V00644 (15-19), V00645..654 (20-64), V00654..657 (65+)
+        brackets = _sum_col_groups(
+            df,
+            {"age_20_64": range(645, 654), "age_65p": range(654, 657)},
+            pattern="V",
+            width=5,
+        )
         df["age_15_19"] = df.get("V00644", 0)
-        df["age_20_64"] = _sum_cols(df, "V", 645, 654, width=5)
-        df["age_65p"] = _sum_cols(df, "V", 654, 657, width=5)
+        df["age_20_64"] = brackets["age_20_64"]
+        df["age_65p"] = brackets["age_65p"]
         total_col = "pessoas"
 
     elif strategy == "ftp_csv":
@@ -135,10 +213,9 @@ def _handle_age_2022(df: pd.DataFrame, strategy: str) -> pd.DataFrame:
     # 3. Residual Logic for 0-14
     # Only calculate if we explicitly have a total population column.
     if total_col and total_col in df.columns:
-        adults_elderly = (
-            df["age_15_19"] + df["age_20_64"] + df["age_65p"]
+        df["age_0_14"] = clipped_residual(
+            df[total_col], [df["age_15_19"], df["age_20_64"], df["age_65p"]]
         )
-        df["age_0_14"] = (df[total_col] - adults_elderly).clip(lower=0)
     else:
         # App layer must derive this after merging with Basic theme
         df["age_0_14"] = np.nan
@@ -157,7 +234,7 @@ def _handle_race_2022(df: pd.DataFrame, strategy: str) -> pd.DataFrame:
 
     # PATH B: BigQuery Strategy (Complex Imputation)
     # Imputes race for children (0-14) based on adult distribution.
-    df = df.fillna(0).copy()
+    df = df.fillna(0)  # already a new frame; no extra copy needed
 
     # 1. Calculate Total Population 15+
     df["pop_15p"] = _sum_cols(df, "V", 644, 657, width=5)
@@ -184,40 +261,94 @@ def _handle_race_2022(df: pd.DataFrame, strategy: str) -> pd.DataFrame:
             else df.get("id_setor_censitario", pd.Series())
         )
         if not idx.empty:
-            df["id_mun"] = idx.astype(str).str.slice(0, 7)
+            if pd.api.types.is_integer_dtype(idx):
+                # int64 tract codes (normalize_tract_ids): the muni code is
+                # the leading 7 of 15 digits, an integer key for factorize
+                df["id_mun"] = idx.to_numpy() // 10**8
+            else:
+                df["id_mun"] = idx.astype(str).str.slice(0, 7)
 
     if "id_mun" in df.columns:
         race_cols_15p = [f"race_{r}_15p" for r in CENSO_RACES]
-        muni_sums = df.groupby("id_mun")[race_cols_15p + ["pop_15p"]].sum()
+        codes, uniq = pd.factorize(df["id_mun"])
+        adults = df[race_cols_15p].to_numpy(dtype=np.float64)
+
+        # One scatter-add per muni instead of a groupby + five .map joins
+        # (rows with an unknown muni, code -1, are left out of the sums)
+        known = codes >= 0
+        race_sums = np.zeros((len(uniq), len(CENSO_RACES)))
+        np.add.at(race_sums, codes[known], adults[known])
+        pop_sums = np.bincount(
+            codes[known],
+            weights=df["pop_15p"].to_numpy(dtype=np.float64)[known],
+            minlength=len(uniq),
+        )
 
         with np.errstate(divide='ignore', invalid='ignore'):
-            muni_ratios = muni_sums[race_cols_15p].div(
-                muni_sums["pop_15p"], axis=0
-            ).fillna(0)
+            muni_ratios = np.where(
+                pop_sums[:, None] > 0, race_sums / pop_sums[:, None], 0.0
+            )
+        # Trailing NaN row catches code -1 (unknown muni)
+        muni_ratios = np.vstack([muni_ratios, np.full(len(CENSO_RACES), np.nan)])
+
+        # 5. Apply ratios (all races in one broadcast)
+        children = df["age_0_14"].to_numpy(dtype=np.float64)[:, None]
+        imputed = adults + children * muni_ratios[codes]
+        return pd.DataFrame(
+            imputed,
+            index=df.index,
+            columns=[f"cor_{r}" for r in CENSO_RACES],
+        )
+
+    return df[[f"cor_{r}" for r in CENSO_RACES if f"cor_{r}" in df.columns]]
 
-        # 5. Apply ratios
-        for race in CENSO_RACES:
-            col_15p = f"race_{race}_15p"
-            ratio_series = df["id_mun"].map(muni_ratios[col_15p])
 
-            target_col = f"cor_{race}"
-            df[target_col] = df[col_15p] + (df["age_0_14"] * ratio_series)
+# --- Declarative Transformers ---
+# Themes that only rename/select columns are described as data:
+# (rename_map, output columns or None to keep every column).
+
+# Read-only views: the dispatch tables are fixed at import time.
+_RENAME_TRANSFORMS: Mapping[tuple, Tuple[Dict[str, str], Optional[Tuple[str, ...]]]] = MappingProxyType({
+    ("basic", 2010): ({"v002": "habitantes", "v001": "domicilios"}, None),
+    ("income", 2010): ({"v009": "rendimento_medio"}, None),
+    ("race", 2010): (
+        {
+            "v002": "cor_branca",
+            "v003": "cor_preta",
+            "v004": "cor_amarela",
+            "v005": "cor_parda",
+            "v006": "cor_indigena",
+        },
+        tuple(f"cor_{r}" for r in CENSO_RACES),
+    ),
+    # BD ships 'pessoas'; FTP already mapped to 'habitantes' via Catalog
+    ("basic", 2022): ({"pessoas": "habitantes"}, None),
+    # FTP already mapped to 'rendimento_medio'
+    ("income", 2022): ({}, None),
+})
 
-    return df[[f"cor_{r}" for r in CENSO_RACES if f"cor_{r}" in df.columns]]
+
+def _apply_rename_transform(
+    df: pd.DataFrame,
+    rename_map: Dict[str, str],
+    outputs: Optional[Tuple[str, ...]],
+) -> pd.DataFrame:
+    """Applies a declarative transform: one rename, then column selection."""
+    if rename_map:
+        df = df.rename(columns=rename_map)
+    if outputs is None:
+        return df
+    # Return only the canonical columns if they exist
+    return df[[c for c in outputs if c in df.columns]]
 
 
 # --- Dispatcher ---
 
-_HANDLERS: Dict[tuple, Callable[[pd.DataFrame, str], pd.DataFrame]] = {
-    ("basic", 2010): _handle_basic_2010,
-    ("basic", 2022): _handle_basic_2022,
-    ("income", 2010): _handle_income_2010,
-    ("income", 2022): _handle_income_2022,
-    ("race", 2010): _handle_race_2010,
+_HANDLERS: Mapping[tuple, Callable[[pd.DataFrame, str], pd.DataFrame]] = MappingProxyType({
     ("race", 2022): _handle_race_2022,
     ("age", 2010): _handle_age_2010,
     ("age", 2022): _handle_age_2022,
-}
+})
 
 
 def standardize_census_dataframe(
@@ -229,6 +360,10 @@ def standardize_census_dataframe(
     """
     Main dispatch function to harmonize raw Census dataframes.
     """
+    transform = _RENAME_TRANSFORMS.get((theme, year))
+    if transform:
+        return _apply_rename_transform(df, *transform)
+
     handler = _HANDLERS.get((theme, year))
     if handler:
         return handler(df, strategy)
@@ -4,9 +4,10 @@ AtlasBR - Core Logic for Geocoding.
 Reusable logic to attach geometries to dataframes based on common keys (CEP).
 """
 
+import numpy as np
 import pandas as pd
 import geopandas as gpd
-from shapely import wkt
+import shapely
 
 def points_from_coords(
     df: pd.DataFrame, 
@@ -14,13 +15,36 @@ def points_from_coords(
     lon_col: str = "longitude",
     crs: str = "EPSG:4326"
 ) -> gpd.GeoDataFrame:
-    """Converts a DataFrame with lat/lon columns into a GeoDataFrame."""
+    """
+    Converts a DataFrame with lat/lon columns into a GeoDataFrame.
+    Rows with missing or non-numeric coordinates get a null geometry.
+    """
+    # Shapely expects (x, y) = (lon, lat)
+    lon = pd.to_numeric(df[lon_col], errors="coerce").to_numpy(dtype=float)
+    lat = pd.to_numeric(df[lat_col], errors="coerce").to_numpy(dtype=float)
+    valid = np.isfinite(lon) & np.isfinite(lat)
+
+    geoms = np.full(len(df), None, dtype=object)
+    geoms[valid] = shapely.points(lon[valid], lat[valid])
+
     return gpd.GeoDataFrame(
         df,
-        geometry=gpd.points_from_xy(df[lon_col], df[lat_col]),
+        geometry=gpd.GeoSeries(geoms, index=df.index, crs=crs),
         crs=crs
     )
 
+def normalize_cep_keys(ceps: pd.Series) -> np.ndarray:
+    """
+    CEP codes (int, float, '24020005', '24020-005', ...) as float64 join keys.
+    Non-digits are stripped, so zero-padding is implied; missing or empty
+    codes become NaN.
+    """
+    if pd.api.types.is_numeric_dtype(ceps):
+        return pd.to_numeric(ceps, errors="coerce").to_numpy(dtype=np.float64)
+
+    digits = ceps.astype(str).str.replace(r"\.0$|\D", "", regex=True)
+    return pd.to_numeric(digits, errors="coerce").to_numpy(dtype=np.float64)
+
 def geocode_by_cep(
     data_df: pd.DataFrame,
     cep_df: pd.DataFrame,
@@ -29,47 +53,36 @@ def geocode_by_cep(
     geometry_col: str = "centroide"
 ) -> gpd.GeoDataFrame:
     """
-    Merges a dataset with a CEP reference table and converts to GeoDataFrame.
+    Attaches CEP centroids (WKT in `geometry_col`) to a dataset as a GeoDataFrame.
+
+    Keys are normalized to integers on both sides and matched by a hash
+    lookup on the reference CEPs, so the (wide) dataset is never merged or
+    copied. Each referenced CEP's WKT is parsed once, however many rows share
+    it. Duplicate CEPs in the reference keep their first centroid.
+
+    The result has one row per data row, with the data's index and columns
+    (including `data_cep_col`) plus 'geometry'; unmatched rows get None.
     """
-    # 1. Prepare Keys
-    data_df = data_df.copy()
-    data_df["_merge_key"] = data_df[data_cep_col].astype(str).str.zfill(8)
-    
-    cep_ref = cep_df.copy()
-    cep_ref[cep_ref_col] = cep_ref[cep_ref_col].astype(str).str.zfill(8)
+    # 1. Prepare Keys (one entry per valid reference CEP)
+    ref_keys = pd.Index(normalize_cep_keys(cep_df[cep_ref_col]))
+    keep = ~(ref_keys.duplicated() | ref_keys.isna())
+    ref_rows = np.flatnonzero(keep)
+
+    # 2. Lookup: position of each data CEP in the reference (-1 = no match)
+    pos = ref_keys[keep].get_indexer(normalize_cep_keys(data_df[data_cep_col]))
+    matched = pos >= 0
 
-    # 2. Merge
-    # Use suffixes to ensure we know which 'cep' is which if names collide
-    merged = pd.merge(
+    # 3. Parse Geometry (WKT -> Shapely), only for the CEPs actually used
+    used, inverse = np.unique(pos[matched], return_inverse=True)
+    wkt_used = cep_df[geometry_col].to_numpy(dtype=object)[ref_rows[used]]
+    wkt_used = np.where(pd.notna(wkt_used), wkt_used, None)
+
+    geoms = np.full(len(data_df), None, dtype=object)
+    geoms[matched] = shapely.from_wkt(wkt_used)[inverse]
+
+    # 4. Convert to GeoDataFrame (data columns untouched)
+    return gpd.GeoDataFrame(
         data_df,
-        cep_ref[[cep_ref_col, geometry_col]],
-        left_on="_merge_key",
-        right_on=cep_ref_col,
-        how="left",
-        suffixes=("", "_ref") 
+        geometry=gpd.GeoSeries(geoms, index=data_df.index, crs="EPSG:4326"),
+        crs="EPSG:4326"
     )
-    
-    # 3. Parse Geometry (WKT -> Shapely)
-    # Filter out missing geometries to avoid parser errors
-    mask_geom = merged[geometry_col].notna()
-    
-    # Create a temporary geometry series
-    geoms = pd.Series(index=merged.index, dtype="object")
-    geoms[mask_geom] = merged.loc[mask_geom, geometry_col].apply(wkt.loads)
-    
-    # 4. Convert to GeoDataFrame
-    gdf = gpd.GeoDataFrame(merged, geometry=geoms, crs="EPSG:4326")
-    
-    # 5. Clean up auxiliary columns safely
-    # If the ref column name collided, it might be named 'cep_ref' now due to suffixes logic above
-    cols_to_drop = ["_merge_key", geometry_col]
-    
-    # Check if the ref column name changed due to collision
-    if cep_ref_col in gdf.columns:
-        cols_to_drop.append(cep_ref_col)
-    elif f"{cep_ref_col}_ref" in gdf.columns:
-        cols_to_drop.append(f"{cep_ref_col}_ref")
-        
-    gdf = gdf.drop(columns=cols_to_drop, errors="ignore")
-    
-    return gdf
\ No newline at end of file
@@ -5,8 +5,10 @@ Adapts Schools and CNES dataframes to match the RAIS schema,
 including assigning proxy CNAE codes and column mapping.
 """
 
+import numpy as np
 import pandas as pd
 import geopandas as gpd
+from typing import List
 from atlasbr.core.logic import rais as rais_logic
 
 # --- Constants: Proxy CNAEs ---
@@ -29,20 +31,22 @@ def _harmonize_generic(
     """
     Shared logic to map columns, assign CNAEs, and enrich metadata.
     """
-    df = df.copy()
-    
     # 1. Rename to match RAIS columns (e.g. 'quantidade_profissional' -> 'quantidade_vinculos_ativos')
+    # rename returns a new frame, so the caller's data is never mutated
+    # and no upfront full copy is needed.
     df = df.rename(columns=rename_map)
     
     # 2. Assign RAIS-compatible static values
-    df["cnae_2"] = cnae_code
-    df["natureza_juridica"] = "1000"  # Public Administration Generic
-    df["tipo_estabelecimento"] = estab_type
-    
     # 3. Handle 'cep'
     # Schools might not have it (None), CNES/RAIS do. Ensure it exists for consistency.
+    constants = {
+        "cnae_2": cnae_code,
+        "natureza_juridica": "1000",  # Public Administration Generic
+        "tipo_estabelecimento": estab_type,
+    }
     if "cep" not in df.columns:
-        df["cep"] = None
+        constants["cep"] = None
+    df = df.assign(**constants)
 
     # 4. Enrich with CNAE Metadata (Section Letter, Sector Name)
     # This ensures these rows look EXACTLY like native RAIS rows
@@ -70,6 +74,51 @@ def _harmonize_generic(
     
     return df[final_cols]
 
+def _numpy_dtype(dtype) -> np.dtype:
+    """NumPy dtype behind a (possibly extension) dtype, e.g. Int64 -> int64."""
+    return np.dtype(getattr(dtype, "numpy_dtype", dtype))
+
+def _can_conform(values: pd.Series, dtype) -> bool:
+    """True when `values` can take `dtype` without changing any value."""
+    if values.isna().all():
+        return True
+    if pd.api.types.is_string_dtype(dtype):
+        return pd.api.types.is_string_dtype(values.dtype)
+    if pd.api.types.is_numeric_dtype(values.dtype) and pd.api.types.is_numeric_dtype(dtype):
+        # Nullable (Int16, Int64...) and Arrow dtypes compare by their
+        # NumPy equivalents; anything NumPy can't interpret is left as is.
+        try:
+            return np.can_cast(
+                _numpy_dtype(values.dtype), _numpy_dtype(dtype), casting="safe"
+            )
+        except TypeError:
+            return False
+    return False
+
+def conform_to_schema(
+    df: pd.DataFrame,
+    columns: List[str],
+    dtypes: pd.Series
+) -> pd.DataFrame:
+    """
+    Reindexes `df` to `columns` and casts shared columns to `dtypes`
+    (e.g. the main RAIS frame's), so a later concat stacks matching blocks
+    instead of upcasting column by column. Only lossless casts are made
+    (int16 -> int64, object strings -> str); anything else is left as is.
+    """
+    df = df.reindex(columns=columns)
+    casts = {}
+    for col, dtype in dtypes.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        if not _can_conform(df[col], dtype):
+            continue
+        try:
+            casts[col] = df[col].astype(dtype)
+        except (TypeError, ValueError):
+            pass  # e.g. all-missing column into a non-nullable int
+    return df.assign(**casts) if casts else df
+
 def harmonize_schools_to_rais(df_schools: pd.DataFrame) -> pd.DataFrame:
     """Adapts School data to RAIS schema."""
     # Filter only Public schools if 'rede' column exists
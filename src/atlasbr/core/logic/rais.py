@@ -17,16 +17,63 @@ _CNAE_PREFIX_TO_SECTION = {
     for i in range(start, end + 1)
 }
 
+# 2-digit prefix (0-99) -> metadata lookup tables; slot 100 is the NaN
+# target for missing or malformed codes.
+_MISSING_PREFIX = 100
+_SECTION_LUT = np.full(_MISSING_PREFIX + 1, np.nan, dtype=object)
+for _prefix, _letter in _CNAE_PREFIX_TO_SECTION.items():
+    _SECTION_LUT[int(_prefix)] = _letter
+_SECTOR_LUT = np.array(
+    [CNAE_SECTOR_NAMES.get(s, np.nan) for s in _SECTION_LUT], dtype=object
+)
+
+# 3-digit prefix (0-999) -> "problematic sector" flag
+_PROBLEM_LUT = np.zeros(1000, dtype=bool)
+for _prefix in CNAE_PROBLEM_PREFIXES:
+    _scale = 10 ** (3 - len(_prefix))
+    _PROBLEM_LUT[int(_prefix) * _scale:(int(_prefix) + 1) * _scale] = True
+
+def _cnae_prefix(cnae: pd.Series, digits: int, missing: int) -> np.ndarray:
+    """Leading `digits` of the 7-digit CNAE code as int; invalid -> `missing`."""
+    codes = pd.to_numeric(cnae, errors="coerce").to_numpy(dtype=np.float64)
+    valid = np.isfinite(codes) & (codes >= 0) & (codes < 10**7)
+    prefix = np.full(len(codes), missing, dtype=np.int64)
+    prefix[valid] = codes[valid].astype(np.int64) // 10 ** (7 - digits)
+    return prefix
+
+def _grouped_quantile(values: np.ndarray, groups: np.ndarray, q: float):
+    """
+    Linear-interpolated quantile per group (same as `groupby().quantile(q)`,
+    NaNs skipped). Each group is a contiguous slice after one stable sort,
+    and only the two order statistics around the quantile are selected
+    with `np.partition` (O(k) instead of a full sort per group).
+    Returns (group keys, quantiles).
+    """
+    valid = ~np.isnan(values)
+    values, groups = values[valid], groups[valid]
+    order = np.argsort(groups, kind="stable")
+    values, groups = values[order], groups[order]
+
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    ends = np.r_[starts[1:], len(groups)]
+    out = np.empty(len(starts))
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        pos = q * (end - start - 1)
+        lo = int(np.floor(pos))
+        hi = min(lo + 1, end - start - 1)
+        seg = np.partition(values[start:end], [lo, hi])
+        out[i] = seg[lo] + (seg[hi] - seg[lo]) * (pos - lo)
+    return groups[starts], out
+
 def enrich_cnae_metadata(df: pd.DataFrame, cnae_col: str = "cnae_2") -> pd.DataFrame:
     """Adds 'section_letter' and 'sector_name' columns based on CNAE code."""
     if df.empty:
         return df
         
-    # Extract first 2 digits
-    prefixes = df[cnae_col].astype(str).str.zfill(7).str[:2]
-    
-    df["cnae_section"] = prefixes.map(_CNAE_PREFIX_TO_SECTION)
-    df["cnae_sector"] = df["cnae_section"].map(CNAE_SECTOR_NAMES)
+    # Integer arithmetic replaces zfill(7)[:2]; one fancy index per column
+    prefix = _cnae_prefix(df[cnae_col], 2, _MISSING_PREFIX)
+    df["cnae_section"] = _SECTION_LUT[prefix]
+    df["cnae_sector"] = _SECTOR_LUT[prefix]
     
     return df
 
@@ -35,47 +82,47 @@ def clip_outlier_jobs(df: pd.DataFrame, jobs_col: str = "quantidade_vinculos_ati
     Clips job counts for problematic sectors (e.g., HQ of cleaning companies).
     Logic: If CNAE prefix is problematic AND jobs > p95 of that prefix -> Clip to p95.
     """
-    df = df.copy()
-    
-    # 1. Identify Problematic Rows
-    # Check if CNAE starts with any problem prefix
-    is_problematic = df["cnae_2"].astype(str).str.startswith(tuple(CNAE_PROBLEM_PREFIXES))
+    # 1. Identify Problematic Rows (integer prefix + boolean LUT, no strings)
+    prefix3 = _cnae_prefix(df["cnae_2"], 3, -1)
+    is_problematic = (prefix3 >= 0) & _PROBLEM_LUT[np.maximum(prefix3, 0)]
     
     if not is_problematic.any():
         return df
 
-    # 2. Calculate P95 per Prefix (only for the problematic subset to save time)
-    # Extract prefix for grouping
-    df["_prefix"] = df["cnae_2"].astype(str).str.extract(r'^(\d{2,3})')[0]
-    
-    # Calculate thresholds (Returns Floats)
-    stats = df[is_problematic].groupby("_prefix")[jobs_col].quantile(0.95)
+    # 2. Calculate P95 per 3-digit Prefix (problematic subset only)
+    jobs = pd.to_numeric(df[jobs_col], errors="coerce").to_numpy(dtype=np.float64)
+    # Prefixes are < 1000: int16 keys let the stable sort run as a radix sort
+    sub_prefix = prefix3[is_problematic].astype(np.int16)
+    keys, quantiles = _grouped_quantile(jobs[is_problematic], sub_prefix, 0.95)
+
+    p95 = np.full(len(_PROBLEM_LUT), np.nan)
+    p95[keys] = quantiles
     
     # 3. Apply Clipping
-    # Map p95 back to the main dataframe
-    df["_p95"] = df["_prefix"].map(stats)
+    # Logic: If problem AND jobs > p95, use p95 (rounded: jobs are integers)
+    threshold = np.full(len(df), np.nan)
+    threshold[is_problematic] = p95[sub_prefix]
+    with np.errstate(invalid="ignore"):
+        mask_clip = is_problematic & (jobs > threshold)
     
-    # Logic: If problem AND jobs > p95, use p95
-    mask_clip = is_problematic & (df[jobs_col] > df["_p95"])
-    
-    # --- FIX: Type Safety for Nullable Integers ---
     if mask_clip.any():
-        # Get the threshold values as floats
-        threshold_vals = df.loc[mask_clip, "_p95"]
-        
-        # Round and cast to int to satisfy Int64 column constraints
-        # .fillna(0) is a defensive check, though the mask implies values exist
-        threshold_vals = threshold_vals.fillna(0).round().astype(int)
-        
-        # Assign safely
-        df.loc[mask_clip, jobs_col] = threshold_vals
+        # Only the jobs column is rebuilt; the input frame is left untouched
+        clipped = df[jobs_col].copy()
+        clipped[mask_clip] = np.round(threshold[mask_clip]).astype(int)
+        df = df.assign(**{jobs_col: clipped})
     
-    # Cleanup helper columns
-    return df.drop(columns=["_prefix", "_p95"])
+    return df
 
 def filter_invalid_legal_nature(df: pd.DataFrame) -> pd.DataFrame:
     """Removes Public Administration entities (starts with '1') or '2011'."""
     # Logic from original SQL: NOT (LEFT(natureza, 1)='1' OR nat='2011')
-    nat = df["natureza_juridica"].astype(str)
-    mask_valid = ~(nat.str.startswith("1") | (nat == "2011"))
-    return df[mask_valid]
\ No newline at end of file
+    nat = df["natureza_juridica"]
+    if pd.api.types.is_numeric_dtype(nat):
+        # Codes are 4 digits (CONCLA), so '1xxx' is an integer range test;
+        # this skips rendering every code as a string.
+        codes = nat.to_numpy(dtype=np.float64, na_value=np.nan)
+        mask_public = ((codes // 1000) == 1) | (codes == 2011)
+    else:
+        nat = nat.astype(str)
+        mask_public = (nat.str.startswith("1") | (nat == "2011")).to_numpy()
+    return df[~mask_public]
\ No newline at end of file
@@ -7,13 +7,17 @@ import pandas as pd
 from typing import List, Optional, Set
 
 from atlasbr.core.catalog.census import CensusThemeSpec
+from atlasbr.core.logic.census import normalize_tract_ids
+from atlasbr.infra.adapters.dtypes import to_arrow_strings
+from atlasbr.infra.storage.cache import cached_query
 from atlasbr.settings import get_billing_id, logger
 
 
 def fetch_census_bd(
     spec: CensusThemeSpec,
     munis: List[int],
-    billing_id: Optional[str] = None
+    billing_id: Optional[str] = None,
+    tract_ids: Optional[List[int]] = None,
 ) -> pd.DataFrame:
     """
     Fetches Census data from Base dos Dados (BigQuery).
@@ -22,6 +26,8 @@ def fetch_census_bd(
         spec: The Census theme specification.
         munis: List of 7-digit municipality IDs.
         billing_id: Google Cloud Project ID for billing.
+        tract_ids: Optional tract codes to restrict the query to (e.g. the
+            urban tracts), so BigQuery returns only those rows.
 
     Returns:
         pd.DataFrame: Data indexed by 'id_setor_censitario'.
@@ -53,13 +59,21 @@ def fetch_census_bd(
         FROM `{spec.table_id}`
         WHERE id_municipio IN ({muni_list_sql})
     """
+    if tract_ids:
+        # Codes are integers here (normalize_tract_ids), so inlining is safe
+        tract_list_sql = ", ".join(f"'{int(t)}'" for t in tract_ids)
+        query += f"      AND id_setor_censitario IN ({tract_list_sql})\n"
 
     logger.info(
         f"    ☁️  Querying Base dos Dados ({spec.theme} {spec.year})..."
     )
 
     # 2. Execute
-    df = bd.read_sql(query, billing_project_id=project_id)
+    # The BigQuery Storage API streams Arrow record batches instead of
+    # paginating JSON rows through the REST endpoint.
+    df = cached_query(query, lambda: bd.read_sql(
+        query, billing_project_id=project_id, use_bqstorage_api=True
+    ))
 
     # 3. Post-processing
     # Standardize column names so BD and FTP strategies return compatible outputs
@@ -68,13 +82,17 @@ def fetch_census_bd(
 
     # Standardize ID and set index for joins
     if "id_setor_censitario" in df.columns:
-        df["id_setor_censitario"] = (
-            df["id_setor_censitario"].astype(str).str.zfill(15)
-        )
+        ids = normalize_tract_ids(df["id_setor_censitario"])
+        if len(ids) < len(df):
+            df = df.loc[ids.index]  # rows without a usable code
+        df["id_setor_censitario"] = ids
         df = df.set_index("id_setor_censitario")
 
-    # Ensure numeric types for data columns
+    # Ensure numeric types for data columns (non-numeric ones are kept as-is)
     for col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors="ignore")
+        try:
+            df[col] = pd.to_numeric(df[col])
+        except (ValueError, TypeError):
+            pass
 
-    return df
\ No newline at end of file
+    return to_arrow_strings(df)
\ No newline at end of file
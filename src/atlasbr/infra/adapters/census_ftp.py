@@ -11,12 +11,13 @@ import fnmatch
 import re
 import pandas as pd
 import numpy as np
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from pathlib import Path, PurePosixPath
-from typing import List, Set, Tuple, Optional
+from typing import Dict, List, Set, Tuple, Optional, Union
 
 from atlasbr.core.catalog.census import CensusThemeSpec
+from atlasbr.core.logic.census import normalize_tract_ids
 from atlasbr.settings import logger
 from atlasbr.infra.storage.cache import cached_download, url_to_filename
 
@@ -32,6 +33,9 @@ STATE_MAP = {
 SP_STATE_CODE = 35
 SP_CAPITAL_MUNI = 3550308  # São Paulo (capital) municipality code (7 digits)
 
+# Concurrent downloads per fetch (keeps us polite towards IBGE's server)
+_MAX_PARALLEL_DOWNLOADS = 5
+
 
 @lru_cache(maxsize=32)
 def _ibge_dir_zip_listing(dir_url: str) -> List[str]:
@@ -115,12 +119,35 @@ def _stems_for_state_2010(uf: str, munis: List[int]) -> List[str]:
     return stems
 
 
-@lru_cache(maxsize=32)
-def _download_zip_ftp(url: str) -> BytesIO:
-    """Downloads a ZIP file from a URL to the local cache."""
+def _download_zip_ftp(url: str) -> Path:
+    """
+    Downloads a ZIP file from a URL to the local cache.
+
+    Returns the cached path rather than an in-memory buffer, so concurrent
+    theme fetches can each open their own handle on the same archive.
+    """
     rel = Path("ibge") / "census" / url_to_filename(url, suffix=".zip")
-    zip_path = cached_download(url, relpath=rel, timeout=180)
-    return BytesIO(zip_path.read_bytes())
+    return cached_download(url, relpath=rel, timeout=180)
+
+
+def _prefetch_zips(urls: List[str]) -> Dict[str, Union[Path, Exception]]:
+    """
+    Downloads all ZIPs of a fetch plan with bounded concurrency.
+
+    Failures are returned in place of the path so the caller can report
+    them per state, exactly as a sequential download would.
+    """
+    unique_urls = list(dict.fromkeys(urls))
+
+    def _safe_download(url: str) -> Union[Path, Exception]:
+        try:
+            return _download_zip_ftp(url)
+        except Exception as e:
+            return e
+
+    workers = max(1, min(_MAX_PARALLEL_DOWNLOADS, len(unique_urls)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(unique_urls, executor.map(_safe_download, unique_urls)))
 
 
 def _resolve_target_urls(
@@ -255,16 +282,20 @@ def fetch_census_ftp(spec: CensusThemeSpec, munis: List[int]) -> pd.DataFrame:
             if res.id_col not in load_cols:
                 load_cols.append(res.id_col)
 
-    # 3) Execute downloads
-    for url, glob_pattern, uf_context, resource in fetch_plan:
+    # 3) Execute downloads (overlapped), then parse in plan order
+    for _, _, uf_context, _ in fetch_plan:
         logger.info(
             f"    ⬇️  Fetching {spec.theme} ({uf_context}) from IBGE FTP..."
         )
+    downloads = _prefetch_zips([url for url, *_ in fetch_plan])
 
+    for url, glob_pattern, uf_context, resource in fetch_plan:
         try:
-            zip_bytes = _download_zip_ftp(url)
+            zip_path = downloads[url]
+            if isinstance(zip_path, Exception):
+                raise zip_path
 
-            with zipfile.ZipFile(zip_bytes) as zf:
+            with zipfile.ZipFile(zip_path) as zf:
                 candidates = _match_zip_members(zf.namelist(), glob_pattern)
 
                 if not candidates:
@@ -301,30 +332,25 @@ def fetch_census_ftp(spec: CensusThemeSpec, munis: List[int]) -> pd.DataFrame:
                             df_chunk = df_chunk.rename(columns=spec.column_map)
 
                         if "id_setor_censitario" in df_chunk.columns:
-                            # Standardize ID
-                            df_chunk["id_setor_censitario"] = (
+                            # Standardize ID (blank trailer rows carry no code)
+                            df_chunk = df_chunk.dropna(
+                                subset=["id_setor_censitario"]
+                            )
+                            ids = normalize_tract_ids(
                                 df_chunk["id_setor_censitario"]
-                                .astype(str)
-                                .str.strip()
-                                .str.zfill(15)
                             )
 
                             # Filter rows belonging to requested munis
-                            df_chunk["_muni_temp"] = (
-                                df_chunk["id_setor_censitario"].str[:7]
-                            )
-                            str_munis = {str(m).zfill(7) for m in munis}
-                            df_chunk = df_chunk[
-                                df_chunk["_muni_temp"].isin(str_munis)
-                            ]
-
-                            df_chunk = df_chunk.drop(
-                                columns=["_muni_temp"]
+                            # (the first 7 digits are the municipality code)
+                            ids = ids[(ids // 10**8).isin(munis)]
+                            df_chunk = df_chunk.loc[ids.index].assign(
+                                id_setor_censitario=ids
                             ).set_index("id_setor_censitario")
 
                         # Numeric Conversion
                         for col in df_chunk.columns:
-                            if df_chunk[col].dtype == "object":
+                            # Read with dtype=str: object (pandas < 3) or 'str'
+                            if pd.api.types.is_string_dtype(df_chunk[col].dtype):
                                 df_chunk[col] = df_chunk[col].str.replace(
                                     ",", ".", regex=False
                                 )
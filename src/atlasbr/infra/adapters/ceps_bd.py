@@ -5,6 +5,7 @@ AtlasBR - Infrastructure Adapter for CEPs (Base dos Dados).
 import pandas as pd
 from typing import Iterable
 
+from atlasbr.infra.storage.cache import cached_query
 from atlasbr.settings import get_billing_id, logger
 
 def fetch_ceps_from_bd(
@@ -35,7 +36,10 @@ def fetch_ceps_from_bd(
     """
     
     logger.info(f"    📍 Fetching CEP coordinates from Base dos Dados...")
-    df = bd.read_sql(query, billing_project_id=project_id)
+    # Stream Arrow record batches via the BigQuery Storage API
+    df = cached_query(query, lambda: bd.read_sql(
+        query, billing_project_id=project_id, use_bqstorage_api=True
+    ))
     
     # Standardize CEP to 8 digits string just in case
     if not df.empty:
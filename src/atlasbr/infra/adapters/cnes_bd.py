@@ -2,9 +2,12 @@
 AtlasBR - Infrastructure Adapter for CNES (Base dos Dados).
 """
 
+import numpy as np
 import pandas as pd
 from typing import Iterable
 from atlasbr.core.catalog.cnes import CNES_INFRASTRUCTURE_GROUPS, CNES_UNIT_CODES
+from atlasbr.infra.adapters.dtypes import to_arrow_strings
+from atlasbr.infra.storage.cache import cached_query
 from atlasbr.settings import logger
 
 def _build_infra_selects() -> str:
@@ -15,6 +18,20 @@ def _build_infra_selects() -> str:
         selects.append(f"{sum_expr} AS {alias}")
     return ",\n        ".join(selects)
 
+# Group sums are pushed down to BigQuery; the taxonomy is static, so the
+# SELECT fragment is rendered once at import instead of on every fetch.
+_INFRA_SELECTS_SQL = _build_infra_selects()
+
+def _as_count(values: pd.Series, dtype: type) -> pd.Series:
+    """Casts a count column to `dtype`, refusing values that would wrap."""
+    bounds = np.iinfo(dtype)
+    if len(values) and (values.min() < bounds.min or values.max() > bounds.max):
+        raise ValueError(
+            f"CNES column '{values.name}' holds counts outside the "
+            f"{np.dtype(dtype).name} range [{bounds.min}, {bounds.max}]."
+        )
+    return values.astype(dtype)
+
 def fetch_cnes_from_bd(
     munis: Iterable[int],
     year: int,
@@ -39,7 +56,7 @@ def fetch_cnes_from_bd(
     unit_codes = list(CNES_UNIT_CODES.keys())
     unit_list_sql = ", ".join(f"'{c}'" for c in unit_codes)
     
-    infra_sql = _build_infra_selects()
+    infra_sql = _INFRA_SELECTS_SQL
     
     query = f"""
         WITH estab AS (
@@ -97,4 +114,20 @@ def fetch_cnes_from_bd(
     """
     
     logger.info(f"    🏥 Fetching CNES {month}/{year} from Base dos Dados...")
-    return bd.read_sql(query, billing_project_id=billing_id)
\ No newline at end of file
+    df = cached_query(query, lambda: bd.read_sql(
+        query, billing_project_id=billing_id, use_bqstorage_api=True
+    ))
+
+    # Bed/room counts are small integers (COALESCEd to 0 in SQL) and fit
+    # int16. Worker counts add up every professional of an establishment and
+    # get int32. Widths are fixed, so output dtypes don't depend on the data.
+    for col in CNES_INFRASTRUCTURE_GROUPS:
+        if col in df.columns:
+            df[col] = _as_count(df[col], np.int16)
+    if "quantidade_trabalhadores_saude" in df.columns:
+        df["quantidade_trabalhadores_saude"] = _as_count(
+            df["quantidade_trabalhadores_saude"], np.int32
+        )
+
+    # Codes and names as Arrow strings
+    return to_arrow_strings(df)
\ No newline at end of file
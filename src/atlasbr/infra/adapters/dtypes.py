@@ -0,0 +1,33 @@
+"""
+AtlasBR - Shared dtype handling for the tabular adapters.
+
+String columns are stored Arrow-backed (one buffer per column instead of
+one Python object per cell); numeric columns stay NumPy-backed, since the
+geometry and interpolation kernels consume them as float64 arrays.
+"""
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    # NaN-missing semantics, like pandas 3's default 'str' dtype
+    ARROW_STRING = pd.StringDtype("pyarrow", na_value=np.nan)
+except TypeError:  # pandas < 2.3
+    ARROW_STRING = pd.StringDtype("pyarrow")
+
+
+def to_arrow_strings(
+    df: pd.DataFrame, columns: Optional[Iterable[str]] = None
+) -> pd.DataFrame:
+    """
+    Converts object columns holding strings (pandas < 3 results) to
+    `ARROW_STRING`, in place. Defaults to every column; mixed or non-string
+    object columns are left untouched.
+    """
+    names = df.columns if columns is None else [c for c in columns if c in df.columns]
+    for col in names:
+        values = df[col]
+        if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) == "string":
+            df[col] = values.astype(ARROW_STRING)
+    return df
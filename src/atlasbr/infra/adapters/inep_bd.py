@@ -4,6 +4,8 @@ AtlasBR - Infrastructure Adapter for Schools (Base dos Dados).
 
 import pandas as pd
 from typing import Iterable
+from atlasbr.infra.adapters.dtypes import to_arrow_strings
+from atlasbr.infra.storage.cache import cached_query
 from atlasbr.settings import logger
 
 def fetch_schools_from_bd(
@@ -97,4 +99,8 @@ def fetch_schools_from_bd(
     """
     
     logger.info(f"    🎓 Fetching Schools {year} from Base dos Dados...")
-    return bd.read_sql(query, billing_project_id=billing_id)
\ No newline at end of file
+    df = cached_query(query, lambda: bd.read_sql(
+        query, billing_project_id=billing_id, use_bqstorage_api=True
+    ))
+    # Codes and names as Arrow strings
+    return to_arrow_strings(df)
\ No newline at end of file
@@ -4,8 +4,16 @@ AtlasBR - Infrastructure Adapter for RAIS (Base dos Dados).
 
 import pandas as pd
 from typing import List, Iterable
+from atlasbr.infra.adapters.dtypes import to_arrow_strings
+from atlasbr.infra.storage.cache import cached_query
 from atlasbr.settings import get_billing_id, logger
 
+# Code-like STRING columns (BigQuery) kept as Arrow-backed strings, so the
+# downstream string ops run as Arrow kernels on one buffer per column.
+_STRING_CODE_COLUMNS = (
+    "id_municipio", "tipo_estabelecimento", "cnae_2", "cep", "natureza_juridica",
+)
+
 def fetch_rais_from_bd(
     table_id: str,
     columns: List[str],
@@ -36,4 +44,11 @@ def fetch_rais_from_bd(
     """
     
     logger.info(f"    🏭 Fetching RAIS {year} from Base dos Dados...")
-    return bd.read_sql(query, billing_project_id=project_id)
\ No newline at end of file
+    # Stream Arrow record batches via the BigQuery Storage API (RAIS
+    # extracts are the largest results fetched here)
+    df = cached_query(query, lambda: bd.read_sql(
+        query, billing_project_id=project_id, use_bqstorage_api=True
+    ))
+
+    # Object string columns (pandas < 3) are converted once, at ingestion
+    return to_arrow_strings(df, _STRING_CODE_COLUMNS)
\ No newline at end of file
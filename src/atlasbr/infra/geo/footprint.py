@@ -8,12 +8,14 @@ import geopandas as gpd
 from pathlib import Path
 from functools import lru_cache
 
-from atlasbr.settings import logger
+from atlasbr.settings import get_cache_dir, logger
 from atlasbr.infra.storage.cache import (
     cached_download, 
     cached_extract_zip, 
     url_to_filename, 
-    find_first_file
+    find_first_file,
+    load_parquet_cache,
+    save_parquet_cache,
 )
 
 # Map requested year to the closest available IBGE 'Área Urbanizada' study
@@ -23,6 +25,18 @@ URL_URBAN_AREAS = {
     2019: "https://geoftp.ibge.gov.br/organizacao_do_territorio/tipologias_do_territorio/areas_urbanizadas_do_brasil/2019/Shapefile/AreasUrbanizadas2019_Brasil.zip"
 }
 
+def _read_shapefile(path: Path) -> gpd.GeoDataFrame:
+    """
+    Reads a shapefile through pyogrio's Arrow path when available,
+    which is much faster than fiona's per-feature reads.
+    """
+    try:
+        import pyogrio
+    except ImportError:
+        return gpd.read_file(path)
+    return pyogrio.read_dataframe(path, use_arrow=True)
+
+
 @lru_cache(maxsize=1)
 def fetch_urban_area_raw_gdf(year: int) -> gpd.GeoDataFrame:
     """
@@ -33,6 +47,13 @@ def fetch_urban_area_raw_gdf(year: int) -> gpd.GeoDataFrame:
     epoch = min(URL_URBAN_AREAS.keys(), key=lambda k: abs(k - year))
     url = URL_URBAN_AREAS[epoch]
     
+    # 0. Parsed layer cache (GeoParquet, keyed by the source URL)
+    rel_parquet = Path("ibge") / "urban_areas" / url_to_filename(url, suffix=".parquet")
+    parquet_path = get_cache_dir() / rel_parquet
+    cached = load_parquet_cache(parquet_path, geo=True)
+    if cached is not None:
+        return cached
+
     logger.info(f"    ⬇️  Fetching Urban Areas (Epoch {epoch}) from IBGE (cached)...")
 
     # 1. Download Zip (Cached)
@@ -51,4 +72,6 @@ def fetch_urban_area_raw_gdf(year: int) -> gpd.GeoDataFrame:
     if not shp_path:
         raise FileNotFoundError(f"No .shp file found in extracted Urban Areas for epoch {epoch}.")
     
-    return gpd.read_file(shp_path)
\ No newline at end of file
+    gdf = _read_shapefile(shp_path)
+    save_parquet_cache(gdf, parquet_path)
+    return gdf
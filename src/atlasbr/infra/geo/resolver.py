@@ -4,13 +4,22 @@ AtlasBR - Infrastructure Geo Adapter (Place Resolver).
 Resolves place inputs (IDs or Names) to standard 7-digit IBGE codes.
 Uses 'geobr' for authoritative name resolution and fuzzy matching.
 """
+import sys
 import pandas as pd
 import unicodedata
-from typing import List, Set, Any
+from pathlib import Path
+from collections import defaultdict
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from functools import lru_cache
 
-from atlasbr.settings import logger
+from atlasbr.settings import get_cache_dir, logger
 from atlasbr.core.types import PlaceInput
+from atlasbr.infra.storage.cache import load_parquet_cache, save_parquet_cache
+
+# Normalized geobr lookup table, persisted between sessions
+MUNI_LOOKUP_RELPATH = Path("geobr") / "muni_lookup.parquet"
+# Refreshed from geobr after this many days (new municipalities, renames)
+MUNI_LOOKUP_MAX_AGE_DAYS = 30
 
 
 def _fix_encoding(text: Any) -> str:
@@ -27,25 +36,44 @@ def _fix_encoding(text: Any) -> str:
         return text
 
 
-def _normalize_text(text: Any) -> str:
+def _strip_accents(text: str) -> str:
+    """Fallback transliteration: NFD decomposition, accents dropped."""
+    s = unicodedata.normalize('NFD', text)
+    return s.encode('ascii', 'ignore').decode('utf-8')
+
+
+@lru_cache(maxsize=1)
+def _ascii_folder() -> Callable[[str], str]:
     """
-    Normalizes text for comparison (remove accents, lowercase).
-    Tries 'unidecode' first, falls back to 'unicodedata'.
+    Picks the transliterator once per process.
+    Tries 'unidecode' first (better transliteration), falls back to 'unicodedata'.
     """
-    # 1. Fix encoding artifacts first
-    s = _fix_encoding(text)
-
-    # 2. Try unidecode (better for transliteration)
     try:
         from unidecode import unidecode
-        return unidecode(s).lower().strip()
+        return unidecode
     except ImportError:
-        pass
+        return _strip_accents
+
 
-    # 3. Fallback: NFD decomposition (strip accents)
-    s = unicodedata.normalize('NFD', s)
-    s = s.encode('ascii', 'ignore').decode('utf-8')
-    return s.lower().strip()
+@lru_cache(maxsize=1024)
+def _normalize_text(text: Any) -> str:
+    """
+    Normalizes text for comparison (remove accents, lowercase).
+    Memoized: place inputs repeat heavily (only 27 UFs exist). Results are
+    interned, like the `_muni_indexes` keys, so lookups compare by identity.
+    """
+    # Fix encoding artifacts first, then transliterate
+    return sys.intern(_ascii_folder()(_fix_encoding(text)).lower().strip())
+
+
+def _normalize_column(values: pd.Series) -> pd.Series:
+    """
+    Bulk `_normalize_text` over a column: transliteration runs in one list
+    comprehension, lower/strip as vectorized string ops.
+    """
+    fold = _ascii_folder()
+    folded = [fold(_fix_encoding(x)) for x in values.tolist()]
+    return pd.Series(folded, index=values.index).str.lower().str.strip()
 
 
 @lru_cache(maxsize=1)
@@ -53,7 +81,15 @@ def _fetch_muni_metadata() -> pd.DataFrame:
     """
     Fetches the full municipality list from geobr (Cached).
     Includes fixes for encoding artifacts common on Windows.
+    The normalized table is also kept on disk, so later sessions skip geobr.
     """
+    cache_path = get_cache_dir() / MUNI_LOOKUP_RELPATH
+    cached = load_parquet_cache(
+        cache_path, max_age_days=MUNI_LOOKUP_MAX_AGE_DAYS
+    )
+    if cached is not None:
+        return cached
+
     try:
         import geobr
     except ImportError as e:
@@ -71,20 +107,47 @@ def _fetch_muni_metadata() -> pd.DataFrame:
             raise RuntimeError("geobr returned an empty lookup table.")
 
         # 1. Fix Encoding Artifacts
-        df["name_muni"] = df["name_muni"].apply(_fix_encoding)
-        df["abbrev_state"] = df["abbrev_state"].apply(_fix_encoding)
+        # (list comprehensions skip the per-row overhead of Series.apply)
+        df["name_muni"] = [_fix_encoding(x) for x in df["name_muni"].tolist()]
+        df["abbrev_state"] = [
+            _fix_encoding(x) for x in df["abbrev_state"].tolist()
+        ]
 
         # 2. Normalize for Matching ("Niterói" -> "niteroi")
         # Uses robust helper that works without unidecode
-        df["norm_name"] = df["name_muni"].apply(_normalize_text)
-        df["norm_uf"] = df["abbrev_state"].apply(_normalize_text)
+        df["norm_name"] = _normalize_column(df["name_muni"])
+        df["norm_uf"] = _normalize_column(df["abbrev_state"])
 
+        save_parquet_cache(df, cache_path)
         return df
 
     except Exception as e:
         raise RuntimeError(f"Failed to fetch municipality list: {e}")
 
 
+@lru_cache(maxsize=1)
+def _muni_indexes() -> Tuple[Dict[Tuple[str, str], int], Dict[str, List[Tuple[str, str]]]]:
+    """
+    Hash indexes over the lookup table, built once:
+    (norm_name, norm_uf) -> code, and norm_uf -> [(norm_name, name_muni)].
+    """
+    lookup = _fetch_muni_metadata()
+    by_name_uf: Dict[Tuple[str, str], int] = {}
+    names_by_uf: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+
+    for code, name, norm_name, norm_uf in zip(
+        lookup["code_muni"], lookup["name_muni"],
+        lookup["norm_name"], lookup["norm_uf"],
+    ):
+        # Interned like `_normalize_text` output (identity hits on lookup)
+        norm_name, norm_uf = sys.intern(norm_name), sys.intern(norm_uf)
+        # First row wins, as with the former boolean-mask match
+        by_name_uf.setdefault((norm_name, norm_uf), int(code))
+        names_by_uf[norm_uf].append((norm_name, name))
+
+    return by_name_uf, dict(names_by_uf)
+
+
 def resolve_places_to_ids(places: List[PlaceInput]) -> List[int]:
     """
     Resolves mixed input types to unique 7-digit IBGE IDs.
@@ -92,101 +155,119 @@ def resolve_places_to_ids(places: List[PlaceInput]) -> List[int]:
     Supported Inputs:
     - Codes: 3304557 (int), 3304557.0 (float), "3304557" (str)
     - Names: "Niterói, RJ", ("Niterói", "RJ")
+
+    Results are memoized per input sequence; loaders call this repeatedly.
     """
-    lookup = None  # Lazy load
-    resolved_ids: List[int] = []
-    seen: Set[int] = set()
-
-    for item in places:
-        # --- STRATEGY 1: Is it a Code? ---
-        # Handles Ints, Floats, and Numeric Strings WITHOUT importing geobr
-        try:
-            is_numeric = (
-                isinstance(item, (int, float)) or
-                (isinstance(item, str) and
-                 item.strip().replace('.', '').isdigit())
-            )
-
-            if is_numeric:
-                code = int(float(item))
-                if code not in seen:
-                    seen.add(code)
-                    resolved_ids.append(code)
-                continue  # Done with this item
-        except (ValueError, TypeError):
-            pass
-
-        # --- STRATEGY 2: Is it a Name? ---
-        # Requires geobr lookup (lazy load)
-        if lookup is None:
-            lookup = _fetch_muni_metadata()
-
-        name, uf = None, None
-
-        # Parse "City, UF" or ("City", "UF")
-        if isinstance(item, tuple) and len(item) == 2:
-            name, uf = item
-        elif isinstance(item, str) and "," in item:
-            parts = item.split(",")
-            if len(parts) >= 2:
-                name, uf = parts[0], parts[1]
-
-        if name and uf:
-            clean_name = name.strip()
-            clean_uf = uf.strip()
-
-            s_name = _normalize_text(clean_name)
-            s_uf = _normalize_text(clean_uf)
-
-            # Exact Match
-            match = lookup[
-                (lookup["norm_name"] == s_name) &
-                (lookup["norm_uf"] == s_uf)
-            ]
-
-            if not match.empty:
-                code = int(match.iloc[0]["code_muni"])
-                if code not in seen:
-                    logger.info(
-                        f"    ℹ️  Resolved '{clean_name}, {clean_uf}' "
-                        f"-> {code}"
-                    )
-                    seen.add(code)
-                    resolved_ids.append(code)
-            else:
-                # Fuzzy "Did you mean?" Logic
-                state_matches = lookup[lookup["norm_uf"] == s_uf]
-                if not state_matches.empty:
-                    # Simple containment check since we might lack fuzzywuzzy
-                    mask = state_matches["norm_name"].str.contains(
-                        s_name[:4], na=False
-                    )
-                    possibilities = (
-                        state_matches[mask]["name_muni"]
-                        .head(5).tolist()
-                    )
-
-                    msg = (
-                        f"Could not resolve municipality: '{clean_name}' "
-                        f"in '{clean_uf}'."
-                    )
-                    if possibilities:
-                        msg += f" Did you mean: {possibilities}?"
-                    else:
-                        msg += (
-                            f" (State {clean_uf.upper()} found, "
-                            "but no matching city)."
-                        )
-                    raise ValueError(msg)
-                else:
-                    raise ValueError(
-                        f"Could not find state '{clean_uf}'. "
-                        "Check abbreviation (e.g., 'RJ')."
-                    )
-        else:
-            raise ValueError(
-                f"Invalid place format: '{item}'. "
-                "Use ID (3304557) or 'Name, UF'."
-            )
-
-    return resolved_ids
\ No newline at end of file
+    key = tuple(places)
+    try:
+        hash(key)
+    except TypeError:
+        # Unhashable inputs (e.g. ["Niterói", "RJ"] lists) skip the memo
+        return _resolve_places(places)
+    return list(_resolve_places_cached(key))
+
+
+@lru_cache(maxsize=128)
+def _resolve_places_cached(places: Tuple[PlaceInput, ...]) -> Tuple[int, ...]:
+    """Memoized resolution (returns a tuple so callers can't mutate it)."""
+    return tuple(_resolve_places(places))
+
+
+def _parse_code(item: Any) -> Optional[int]:
+    """Returns the IBGE code for numeric inputs (int, float, digit string)."""
+    try:
+        is_numeric = (
+            isinstance(item, (int, float)) or
+            (isinstance(item, str) and
+             item.strip().replace('.', '').isdigit())
+        )
+        if is_numeric:
+            return int(float(item))
+    except (ValueError, TypeError):
+        pass
+    return None
+
+
+def _resolve_name(
+    item: Any,
+    by_name_uf: Dict[Tuple[str, str], int],
+    names_by_uf: Dict[str, List[Tuple[str, str]]],
+) -> int:
+    """Resolves a 'City, UF' / ('City', 'UF') input through the hash indexes."""
+    name, uf = None, None
+
+    # Parse "City, UF" or ("City", "UF")
+    if isinstance(item, tuple) and len(item) == 2:
+        name, uf = item
+    elif isinstance(item, str) and "," in item:
+        parts = item.split(",")
+        if len(parts) >= 2:
+            name, uf = parts[0], parts[1]
+
+    if not (name and uf):
+        raise ValueError(
+            f"Invalid place format: '{item}'. "
+            "Use ID (3304557) or 'Name, UF'."
+        )
+
+    clean_name = name.strip()
+    clean_uf = uf.strip()
+
+    s_name = _normalize_text(clean_name)
+    s_uf = _normalize_text(clean_uf)
+
+    # Exact Match (O(1) hash lookup)
+    code = by_name_uf.get((s_name, s_uf))
+    if code is not None:
+        logger.info(f"    ℹ️  Resolved '{clean_name}, {clean_uf}' -> {code}")
+        return code
+
+    # Fuzzy "Did you mean?" Logic
+    state_names = names_by_uf.get(s_uf)
+    if not state_names:
+        raise ValueError(
+            f"Could not find state '{clean_uf}'. "
+            "Check abbreviation (e.g., 'RJ')."
+        )
+
+    # Simple containment check since we might lack fuzzywuzzy
+    possibilities = [
+        muni for norm, muni in state_names if s_name[:4] in norm
+    ][:5]
+
+    msg = (
+        f"Could not resolve municipality: '{clean_name}' "
+        f"in '{clean_uf}'."
+    )
+    if possibilities:
+        msg += f" Did you mean: {possibilities}?"
+    else:
+        msg += (
+            f" (State {clean_uf.upper()} found, "
+            "but no matching city)."
+        )
+    raise ValueError(msg)
+
+
+def _resolve_places(places: Any) -> List[int]:
+    """Resolution worker behind `resolve_places_to_ids`."""
+    # 1. Duplicate inputs are resolved once (order of first appearance kept)
+    try:
+        unique = list(dict.fromkeys(places))
+    except TypeError:
+        unique = list(places)  # unhashable items, e.g. ["Niterói", "RJ"]
+
+    # 2. Codes (ints, floats, numeric strings) need no lookup at all
+    codes = [_parse_code(item) for item in unique]
+
+    # 3. Names: only now is the geobr lookup loaded (lazily)
+    if any(code is None for code in codes):
+        by_name_uf, names_by_uf = _muni_indexes()
+        codes = [
+            code if code is not None
+            else _resolve_name(item, by_name_uf, names_by_uf)
+            for item, code in zip(unique, codes)
+        ]
+
+    # 4. Unique IDs, in input order
+    return list(dict.fromkeys(codes))
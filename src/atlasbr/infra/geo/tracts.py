@@ -1,48 +1,129 @@
 """
 AtlasBR - Infrastructure Geo Adapter (Census Tracts).
 """
+import io
+import json
+
 import pandas as pd
 import geopandas as gpd
 import numpy as np
-from typing import Iterable, List
-from atlasbr.settings import logger
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from atlasbr.settings import get_cache_dir, logger
+from atlasbr.infra.storage.cache import load_arrow_cache, save_parquet_cache
+
+# Concurrent geobr downloads
+_MAX_FETCH_WORKERS = 16
+
 
+def _tract_cache_path(code: int, year: int) -> Path:
+    """Cache location of one municipality's tracts (GeoParquet)."""
+    return get_cache_dir() / "geobr" / "tracts" / str(year) / f"{code}.parquet"
 
-def fetch_tracts_raw(munis: Iterable[int], year: int) -> gpd.GeoDataFrame:
+
+def fetch_tracts_raw(
+    munis: Iterable[int],
+    year: int,
+    columns: Optional[List[str]] = None,
+) -> gpd.GeoDataFrame:
     """
     Fetches raw Census Tracts from geobr for the specified municipalities.
-    """
-    try:
-        import geobr
-    except ImportError:
-        raise ImportError(
-            "The 'geobr' library is required to fetch Census Tracts. "
-            "Please install it via `pip install atlasbr[geo]` or "
-            "`pip install geobr`."
-        )
+    Each municipality is cached on disk (GeoParquet), so only missing ones
+    hit the network.
 
+    `columns` limits the attribute columns read back from the cache (the
+    geometry is always included); cache entries always hold the full table.
+    """
     muni_list = [int(m) for m in np.atleast_1d(munis)]
     logger.info(
         f"Fetching Census Tracts for {len(muni_list)} "
         f"municipalities (Year {year})..."
     )
 
-    dfs: List[gpd.GeoDataFrame] = []
-
+    # 1. Warm cache (Arrow tables; decoded into one frame at the end)
+    by_muni: Dict[int, pa.Table] = {}
     for code in muni_list:
+        cached = load_arrow_cache(_tract_cache_path(code, year), columns)
+        if cached is not None:
+            by_muni[code] = cached
+
+    # 2. Fetch the missing subset from geobr
+    missing = [code for code in muni_list if code not in by_muni]
+    if missing:
+        try:
+            import geobr
+        except ImportError:
+            raise ImportError(
+                "The 'geobr' library is required to fetch Census Tracts. "
+                "Please install it via `pip install atlasbr[geo]` or "
+                "`pip install geobr`."
+            )
+
+    def _safe_read(code: int) -> Optional[pa.Table]:
         try:
             # verbose=False suppresses geobr's own print statements
             df = geobr.read_census_tract(
                 code_tract=code, year=year, simplified=False, verbose=False
             )
-            dfs.append(df)
         except Exception as e:
             logger.warning(f"Failed to load tracts for muni {code}: {e}")
-            continue
+            return None
+        path = _tract_cache_path(code, year)
+        save_parquet_cache(df, path)
+        table = load_arrow_cache(path, columns)
+        if table is None:
+            # Cache not writable: encode in memory to the same GeoParquet layout
+            if columns is not None:
+                keep = set(columns) | {df.geometry.name}
+                df = df[[c for c in df.columns if c in keep]]
+            table = pq.read_table(io.BytesIO(df.to_parquet()))
+        return table
+
+    # Downloads are I/O bound, so municipalities are fetched concurrently
+    if missing:
+        workers = min(_MAX_FETCH_WORKERS, len(missing))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for code, table in zip(missing, executor.map(_safe_read, missing)):
+                if table is not None:
+                    by_muni[code] = table
+
+    # Keep the requested municipality order
+    tables: List[pa.Table] = [
+        by_muni[code] for code in muni_list if code in by_muni
+    ]
 
-    if not dfs:
+    if not tables:
         raise RuntimeError(
             "No census tracts found for the requested municipalities."
         )
 
-    return pd.concat(dfs, ignore_index=True)
\ No newline at end of file
+    return _tables_to_gdf(tables)
+
+
+def _tables_to_gdf(tables: List[pa.Table]) -> gpd.GeoDataFrame:
+    """
+    Builds a single GeoDataFrame from per-municipality GeoParquet tables.
+
+    The tables are concatenated in Arrow and converted once, and WKB is
+    decoded in one vectorized call, instead of materializing (and parsing the
+    CRS of) one GeoDataFrame per municipality before a `pd.concat`.
+    """
+    try:
+        table = pa.concat_tables(tables)
+    except pa.ArrowInvalid:
+        # Schemas drifted between cache entries: let pandas align them
+        return pd.concat(
+            [_tables_to_gdf([t]) for t in tables], ignore_index=True
+        )
+
+    geo = json.loads(tables[0].schema.metadata[b"geo"])
+    geom_col = geo["primary_column"]
+    # GeoParquet: an absent 'crs' key means OGC:CRS84, an explicit null none
+    crs = geo["columns"][geom_col].get("crs", "OGC:CRS84")
+
+    df = table.to_pandas()
+    df[geom_col] = gpd.GeoSeries.from_wkb(df[geom_col], crs=crs)
+    return gpd.GeoDataFrame(df, geometry=geom_col, crs=crs)
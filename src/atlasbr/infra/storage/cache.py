@@ -3,16 +3,55 @@
 from __future__ import annotations
 
 import hashlib
+import json
+import threading
+import time
+import weakref
 import zipfile
 import logging
 from pathlib import Path
-from typing import Optional
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
 
+import pandas as pd
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from atlasbr.settings import get_cache_dir, logger
+from atlasbr.settings import (
+    get_cache_dir,
+    get_query_cache,
+    get_query_memo_bytes,
+    logger,
+)
+
+# Query results are keyed by their SQL text (table, year, munis, filters);
+# refreshed after this many days so late BD corrections still come through.
+QUERY_CACHE_MAX_AGE_DAYS = 30
+
+# Recent query results also stay in memory for the session; hits skip the
+# Parquet read as well. The memo is bounded by entries and by total bytes
+# (settings.set_query_memo), and large results (e.g. RAIS extracts) are
+# never kept, so they are not held twice while callers copy them.
+QUERY_MEMO_TTL_SECONDS = 1800
+QUERY_MEMO_MAXSIZE = 16
+_QUERY_MEMO: OrderedDict[Path, Tuple[float, int, pd.DataFrame]] = OrderedDict()
+_QUERY_MEMO_LOCK = threading.RLock()
+
+# One lock per cache entry, so concurrent fetches of the same URL
+# download it once instead of racing on the same temporary file. Entries
+# are weak: a lock is dropped once no caller holds it, so the table only
+# grows with the number of in-flight fetches, not with the session.
+_PATH_LOCKS: weakref.WeakValueDictionary[Path, threading.Lock] = (
+    weakref.WeakValueDictionary()
+)
+_PATH_LOCKS_GUARD = threading.Lock()
+
+
+def _lock_for(path: Path) -> threading.Lock:
+    """Returns the lock guarding a given cache path."""
+    with _PATH_LOCKS_GUARD:
+        return _PATH_LOCKS.setdefault(path, threading.Lock())
 
 
 def url_to_filename(url: str, *, suffix: str = "") -> str:
@@ -56,6 +95,12 @@ def cached_download(
     out = cache_dir / relpath
     out.parent.mkdir(parents=True, exist_ok=True)
 
+    with _lock_for(out):
+        return _download_to(url, out, timeout=timeout, force=force)
+
+
+def _download_to(url: str, out: Path, *, timeout: int, force: bool) -> Path:
+    """Streams a URL into `out` (caller must hold the path lock)."""
     if out.exists() and not force:
         # Optional: Add file size check or header check here if stricter validity needed
         return out
@@ -123,4 +168,163 @@ def find_first_file(root: Path, pattern: str) -> Optional[Path]:
     try:
         return next(root.rglob(pattern))
     except StopIteration:
-        return None
\ No newline at end of file
+        return None
+
+
+def _is_stale(path: Path, max_age_days: Optional[float]) -> bool:
+    """True when a cache entry is older than `max_age_days` (None: never)."""
+    if max_age_days is None:
+        return False
+    return time.time() - path.stat().st_mtime > max_age_days * 86400
+
+
+def load_parquet_cache(
+    path: Path,
+    *,
+    geo: bool = False,
+    max_age_days: Optional[float] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Reads a cached Parquet table (GeoParquet when `geo=True`).
+    Returns None when the entry is missing, unreadable or older than
+    `max_age_days`, so callers rebuild it.
+    """
+    if not path.exists() or _is_stale(path, max_age_days):
+        return None
+    try:
+        if geo:
+            import geopandas as gpd
+            return gpd.read_parquet(path)
+        return pd.read_parquet(path)
+    except Exception as e:
+        logger.warning(f"    ⚠️ Ignoring unreadable cache entry {path.name}: {e}")
+        return None
+
+
+def load_arrow_cache(path: Path, columns: Optional[List[str]] = None):
+    """
+    Reads a cached Parquet file as a `pyarrow.Table`, without building a
+    DataFrame (geometry stays WKB). Returns None when missing or unreadable.
+
+    `columns` projects the read (only those column chunks are decoded);
+    names absent from the file are skipped, and a GeoParquet file's primary
+    geometry column is always kept.
+    """
+    if not path.exists():
+        return None
+    try:
+        import pyarrow.parquet as pq
+        if columns is not None:
+            columns = _projection(pq.read_schema(path), columns)
+        return pq.read_table(path, columns=columns)
+    except Exception as e:
+        logger.warning(f"    ⚠️ Ignoring unreadable cache entry {path.name}: {e}")
+        return None
+
+
+def _projection(schema, columns: List[str]) -> List[str]:
+    """Requested columns present in `schema`, plus its GeoParquet geometry."""
+    keep = set(columns)
+    metadata = schema.metadata or {}
+    if b"geo" in metadata:
+        keep.add(json.loads(metadata[b"geo"])["primary_column"])
+    return [name for name in schema.names if name in keep]
+
+
+def save_parquet_cache(df: pd.DataFrame, path: Path) -> None:
+    """
+    Writes a table to the cache atomically (zstd: smaller than snappy
+    for geometry-heavy tables, and just as fast to read back).
+    Failures only warn: the cache is an optimization, never a requirement.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_out = path.with_name(path.name + ".tmp")
+    try:
+        df.to_parquet(temp_out, compression="zstd")
+        temp_out.replace(path)
+    except Exception as e:
+        temp_out.unlink(missing_ok=True)
+        logger.warning(f"    ⚠️ Could not write cache entry {path.name}: {e}")
+
+
+def _memo_get(path: Path) -> Optional[pd.DataFrame]:
+    """In-process query result for `path`, unless expired."""
+    with _QUERY_MEMO_LOCK:
+        entry = _QUERY_MEMO.get(path)
+        if entry is None:
+            return None
+        stored_at, _, df = entry
+        if time.monotonic() - stored_at > QUERY_MEMO_TTL_SECONDS:
+            del _QUERY_MEMO[path]
+            return None
+        _QUERY_MEMO.move_to_end(path)
+        return df
+
+
+def _memo_put(path: Path, df: pd.DataFrame) -> bool:
+    """
+    Keeps a query result in memory (least recently used evicted first).
+    Returns False when the result is too large to keep.
+    """
+    budget = get_query_memo_bytes()
+    nbytes = int(df.memory_usage(deep=True).sum())
+    with _QUERY_MEMO_LOCK:
+        _QUERY_MEMO.pop(path, None)
+        if nbytes > budget // 4:
+            return False
+        _QUERY_MEMO[path] = (time.monotonic(), nbytes, df)
+        total = sum(size for _, size, _ in _QUERY_MEMO.values())
+        while len(_QUERY_MEMO) > QUERY_MEMO_MAXSIZE or total > budget:
+            _, (_, size, _) = _QUERY_MEMO.popitem(last=False)
+            total -= size
+        return True
+
+
+def cached_query(
+    query: str,
+    run: Callable[[], pd.DataFrame],
+    *,
+    max_age_days: Optional[float] = QUERY_CACHE_MAX_AGE_DAYS,
+    force: bool = False,
+) -> pd.DataFrame:
+    """
+    Returns the result of a SQL query from the cache, or runs it.
+
+    `run` executes `query` (e.g. `bd.read_sql`) and is only called on a
+    miss; its result is stored as Parquet under the SQL text's hash, so a
+    later session with the same theme, year and municipalities skips
+    BigQuery entirely. Within a session, recent results are also kept in
+    memory (QUERY_MEMO_TTL_SECONDS, within the settings.set_query_memo
+    budget) and repeated calls skip the Parquet read too. Callers always
+    get their own frame, free to modify.
+
+    `force=True` (or the 'refresh' mode of `settings.set_query_cache`)
+    re-runs the query and overwrites the stored result; the 'off' mode
+    just runs it. Empty results and a failing `run` store nothing, so a
+    query that found no rows is retried next time.
+    """
+    mode = get_query_cache()
+    if mode == "off":
+        return run()
+    force = force or mode == "refresh"
+
+    path = get_cache_dir() / "queries" / url_to_filename(
+        " ".join(query.split()), suffix=".parquet"
+    )
+    with _lock_for(path):
+        df = None if force else _memo_get(path)
+        if df is not None:
+            return df.copy()
+
+        if not force:
+            df = load_parquet_cache(path, max_age_days=max_age_days)
+        if df is not None and not df.empty:
+            logger.info(f"    💾 Using cached query result ({path.name[:12]})")
+        else:
+            df = run()
+            if df.empty:
+                return df
+            save_parquet_cache(df, path)
+
+        # Only the memoized object is shared; anything else is the caller's
+        return df.copy() if _memo_put(path, df) else df
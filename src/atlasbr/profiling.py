@@ -0,0 +1,30 @@
+"""
+AtlasBR - Lightweight Stage Timing.
+
+Records the wall time of each pipeline stage to the library logger (DEBUG),
+so optimization work can target the stage that actually dominates
+(network I/O, geometry ops or pandas joins).
+"""
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from atlasbr.settings import logger
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Times the enclosed block and logs it at DEBUG level.
+
+    Example:
+        with stage("resolve"):
+            muni_ids = resolver.resolve_places_to_ids(places)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        logger.debug(
+            "    ⏱️  stage %s took %.2fs", name, time.perf_counter() - start
+        )
@@ -3,6 +3,7 @@ AtlasBR - Global Settings & Logging.
 """
 import os
 import logging
+from functools import cache
 from pathlib import Path
 from typing import Optional
 
@@ -13,10 +14,16 @@ logger.addHandler(logging.NullHandler()) # Default to silence unless configured
 # Environment Variable Names
 ENV_BILLING_ID = "ATLASBR_BILLING_ID"
 ENV_CACHE_DIR = "ATLASBR_CACHE_DIR"
+ENV_QUERY_CACHE = "ATLASBR_QUERY_CACHE"
+ENV_QUERY_MEMO_MB = "ATLASBR_QUERY_MEMO_MB"
+
+# Query cache modes: reuse stored results, bypass the cache entirely, or
+# re-run every query and overwrite its entry (e.g. after a BD correction).
+QUERY_CACHE_MODES = ("on", "off", "refresh")
 
 class Settings:
-    _instance = None
-    
+    """Process-wide configuration, read from the environment once."""
+
     def __init__(self):
         # Priority: Env ATLASBR_BILLING_ID -> Env GOOGLE_CLOUD_PROJECT -> None
         self.gcp_billing_id: Optional[str] = (
@@ -32,40 +39,42 @@ class Settings:
         else:
             self.cache_dir = Path.cwd() / ".atlasbr_cache"
 
-    @classmethod
-    def _get_instance(cls):
-        if cls._instance is None:
-            cls._instance = cls()
-        return cls._instance
-
-    @classmethod
-    def get_billing_id(cls) -> str:
-        inst = cls._get_instance()
-        if inst.gcp_billing_id is None:
-            raise ValueError(
-                "GCP Billing ID not set. "
-                "Set 'ATLASBR_BILLING_ID' or 'GOOGLE_CLOUD_PROJECT' env var, "
-                "or call 'atlasbr.set_billing_id()'."
-            )
-        return inst.gcp_billing_id
-
-    @classmethod
-    def set_billing_id(cls, project_id: str):
-        inst = cls._get_instance()
-        inst.gcp_billing_id = project_id
-
-    @classmethod
-    def get_cache_dir(cls) -> Path:
-        inst = cls._get_instance()
-        # Ensure dir exists when requested
-        inst.cache_dir.mkdir(parents=True, exist_ok=True)
-        return inst.cache_dir
+        # Base dos Dados query result cache (see set_query_cache)
+        self.query_cache: str = _parse_query_cache_mode(
+            os.getenv(ENV_QUERY_CACHE, "on")
+        )
+        # In-memory budget for recent query results, in MB (0 disables)
+        self.query_memo_mb: float = float(os.getenv(ENV_QUERY_MEMO_MB, "256"))
+
+
+def _parse_query_cache_mode(mode: str) -> str:
+    """Validates a query cache mode ('on', 'off' or 'refresh')."""
+    mode = mode.strip().lower()
+    if mode not in QUERY_CACHE_MODES:
+        raise ValueError(
+            f"Invalid query cache mode '{mode}'. "
+            f"Use one of {QUERY_CACHE_MODES}."
+        )
+    return mode
+
+
+@cache
+def _get_settings() -> Settings:
+    """The Settings singleton (created on first use)."""
+    return Settings()
 
 # --- Public Helpers (Exposed in __init__.py) ---
 
 def get_billing_id() -> str:
     """Retrieves the current billing ID."""
-    return Settings.get_billing_id()
+    billing_id = _get_settings().gcp_billing_id
+    if billing_id is None:
+        raise ValueError(
+            "GCP Billing ID not set. "
+            "Set 'ATLASBR_BILLING_ID' or 'GOOGLE_CLOUD_PROJECT' env var, "
+            "or call 'atlasbr.set_billing_id()'."
+        )
+    return billing_id
 
 def resolve_billing_id(billing_id: str | None) -> str:
     """Return an explicit billing_id or fall back to Settings/env."""
@@ -73,11 +82,41 @@ def resolve_billing_id(billing_id: str | None) -> str:
 
 def set_billing_id(project_id: str):
     """Sets the Google Cloud Project ID for all subsequent calls."""
-    Settings.set_billing_id(project_id)
+    _get_settings().gcp_billing_id = project_id
 
 def get_cache_dir() -> Path:
     """Retrieves the current cache directory path."""
-    return Settings.get_cache_dir()
+    cache_dir = _get_settings().cache_dir
+    # Ensure dir exists when requested
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+def set_query_cache(mode: str):
+    """
+    Controls the on-disk cache of Base dos Dados query results.
+
+    'on' (default) reuses stored results, 'off' always queries BigQuery
+    without reading or writing the cache, and 'refresh' re-runs every query
+    and overwrites its stored result.
+    """
+    _get_settings().query_cache = _parse_query_cache_mode(mode)
+
+def get_query_cache() -> str:
+    """Retrieves the current query cache mode."""
+    return _get_settings().query_cache
+
+def set_query_memo(max_mb: float):
+    """
+    Sets the memory budget (MB) for query results kept within the session.
+    Results larger than a quarter of it are never kept; 0 disables it.
+    """
+    if max_mb < 0:
+        raise ValueError("max_mb must be >= 0.")
+    _get_settings().query_memo_mb = float(max_mb)
+
+def get_query_memo_bytes() -> int:
+    """Retrieves the in-memory query result budget, in bytes."""
+    return int(_get_settings().query_memo_mb * 2**20)
 
 def configure_logging(level: int = logging.INFO):
     """Enable console logging for the library (idempotent)."""
@@ -4,6 +4,7 @@ import matplotlib.pyplot as plt
 from matplotlib.ticker import FuncFormatter
 import pandas as pd
 
+from atlasbr.settings import logger
 from roda.processing.demographics import (
     filter_states,
     filter_years,
@@ -75,7 +76,7 @@ def plot_population_trend(
 
     columns = select_columns(df, by_age=by_age, gender=gender)
     if not columns:
-        print("No matching columns found.")
+        logger.warning("No matching columns found.")
         return
 
     plot_df = reshape_for_plot(df, columns)
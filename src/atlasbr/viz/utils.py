@@ -5,12 +5,19 @@ Contains utility functions for preparing data, generating labels,
 and managing Plotly figure interactivity.
 """
 
-import json
 import numpy as np
 import pandas as pd
 import geopandas as gpd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyproj import CRS
+from shapely.geometry import mapping
 from typing import List, Tuple, Dict, Any
 
+# Web-map CRS, built once (comparing CRS objects skips parsing 'EPSG:4326')
+WEB_MAP_CRS = CRS.from_epsg(4326)
+
+
 def labels_from_bins(bins: np.ndarray) -> List[str]:
     """
     Build readable class labels from ascending bin edges (exclusive left, inclusive right).
@@ -20,10 +27,11 @@ def labels_from_bins(bins: np.ndarray) -> List[str]:
     if len(bins) == 0:
         return []
     
-    labels = [f"≤ {bins[0]:.2f}"]
-    for a, b in zip(bins[:-1], bins[1:]):
-        labels.append(f"({a:.2f}, {b:.2f}]")
-    return labels
+    # Format every edge once, in a single NumPy pass
+    edges = np.char.mod("%.2f", np.asarray(bins, dtype=np.float64)).tolist()
+    return [f"≤ {edges[0]}"] + [
+        f"({a}, {b}]" for a, b in zip(edges[:-1], edges[1:])
+    ]
 
 
 def visibility_mask(num_vars: int, num_years: int, var_idx: int, year_idx: int) -> List[bool]:
@@ -37,6 +45,18 @@ def visibility_mask(num_vars: int, num_years: int, var_idx: int, year_idx: int)
     return mask
 
 
+def _ids_as_str(ids: pd.Series) -> pd.Series:
+    """
+    Renders location IDs as strings. Integer codes (the usual IBGE case)
+    are formatted by Arrow's cast kernel instead of one `str()` per row;
+    other dtypes keep `astype(str)` (e.g. floats render as '123.0').
+    """
+    if pd.api.types.is_integer_dtype(ids):
+        as_str = pc.cast(pa.array(ids), pa.string())
+        return as_str.to_pandas().set_axis(ids.index).rename(ids.name)
+    return ids.astype(str)
+
+
 def prepare_geodata(
     gdf: gpd.GeoDataFrame, 
     id_col: str, 
@@ -60,37 +80,63 @@ def prepare_geodata(
     available_vars = [c for c in vars_to_show if c in gdf.columns]
     cols_needed = [year_col, id_col, "geometry"] + available_vars
     
-    # Copy to avoid mutating the original
-    gdf_clean = gdf[cols_needed].dropna(subset=[id_col, "geometry"]).copy()
+    # Row and column filters in one selection (no intermediate frames)
+    mask = gdf[id_col].notna() & gdf.geometry.notna()
+    gdf_clean = gdf.loc[mask, cols_needed]
 
     # 2. Ensure Lat/Lon projection (EPSG:4326)
-    if gdf_clean.crs != "EPSG:4326":
-        gdf_clean = gdf_clean.to_crs("EPSG:4326")
+    # to_crs already returns a new frame; otherwise copy once to avoid
+    # mutating the original.
+    if gdf_clean.crs != WEB_MAP_CRS:
+        gdf_clean = gdf_clean.to_crs(WEB_MAP_CRS)
+    else:
+        gdf_clean = gdf_clean.copy()
 
     # Standardize ID to string to avoid JSON key issues
-    gdf_clean[id_col] = gdf_clean[id_col].astype(str)
+    gdf_clean[id_col] = _ids_as_str(gdf_clean[id_col])
 
     # 3. Extract Unique Years
     # Handle mixed types safely, converting to int for sorting
     raw_years = gdf_clean[year_col].unique()
-    try:
-        years = sorted([int(y) for y in raw_years])
-    except (ValueError, TypeError):
+    numeric_years = pd.to_numeric(pd.Series(raw_years), errors="coerce")
+    if len(numeric_years) and numeric_years.notna().all():
+        # np.unique casts, deduplicates (2010 vs "2010") and sorts in C
+        years = np.unique(numeric_years.to_numpy().astype(np.int64)).tolist()
+    else:
         # Fallback for string years
         years = sorted(list(raw_years))
 
     # 4. Extract Base GeoJSON
     # Plotly is faster if we give it one GeoJSON with unique geometries, 
     # rather than duplicating geometry for every year in the dataframe.
-    geo_base = (
-        gdf_clean[[id_col, "geometry"]]
-        .drop_duplicates(subset=[id_col])
-        .set_index(id_col)
-        .sort_index()
+    # IDs are factorized once (sorted uniques, integer codes), and the first
+    # row of each ID comes from np.unique's first-occurrence indices, so
+    # only the unique IDs are sorted as strings (same as drop_duplicates +
+    # sort_index).
+    codes, uniques = pd.factorize(gdf_clean[id_col], sort=True)
+    _, first = np.unique(codes, return_index=True)
+    geo_base = gpd.GeoDataFrame(
+        geometry=gdf_clean.geometry.array[first],
+        index=pd.Index(uniques, name=id_col),
+        crs=gdf_clean.crs,
     )
 
-    # Convert to JSON dict
-    geojson = json.loads(geo_base.reset_index().to_json())
+    # Build the GeoJSON dict directly from the shapely geometries
+    # (no JSON string encode/decode of every coordinate)
+    geojson = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "id": str(i),
+                "type": "Feature",
+                "properties": {id_col: loc},
+                "geometry": mapping(geom),
+            }
+            for i, (loc, geom) in enumerate(
+                zip(geo_base.index, geo_base.geometry)
+            )
+        ],
+    }
     
     # List of IDs in the same order as the GeoJSON features
     locs = geo_base.index.tolist()
@@ -41,4 +41,11 @@ def mock_rais_df():
         "quantidade_vinculos": [10, 5], 
         "cep_estab": ["20000000", "20000001"],
         "natureza_juridica": ["2062", "2062"]
-    })
\ No newline at end of file
+    })
+
+@pytest.fixture
+def tmp_cache_dir(tmp_path, monkeypatch):
+    """Points the AtlasBR cache at a temporary directory."""
+    from atlasbr import settings
+    monkeypatch.setattr(settings._get_settings(), "cache_dir", tmp_path)
+    return tmp_path
@@ -114,4 +114,45 @@ def test_fetch_census_ftp_no_csv_in_zip(mocker, spec_mock):
     mocker.patch("requests.get", return_value=mock_response)
 
     with pytest.raises(FileNotFoundError, match="No CSV file found"):
-        fetch_census_ftp(spec_mock)
\ No newline at end of file
+        fetch_census_ftp(spec_mock)
+
+def test_fetch_census_ftp_parses_numbers_read_as_strings(monkeypatch, tmp_path):
+    """
+    Values are read with dtype=str, which is 'object' before pandas 3 and
+    the 'str' dtype from pandas 3 on; both must become numbers.
+    """
+    from types import SimpleNamespace
+    from atlasbr.infra.adapters import census_ftp
+
+    zip_path = tmp_path / "dados.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr(
+            "Basico_RJ.csv",
+            "Cod_setor;V001;V002\n"
+            "330455705000001;1000,50;X\n"
+            "330455705000002;2000;10,5\n",
+        )
+
+    resource = SimpleNamespace(sep=";", encoding="utf-8", id_col="Cod_setor")
+    spec = SimpleNamespace(
+        theme="test_theme",
+        column_map={
+            "Cod_setor": "id_setor_censitario",
+            "V001": "renda_media",
+            "V002": "populacao",
+        },
+        ftp_resources=[resource],
+    )
+    monkeypatch.setattr(
+        census_ftp,
+        "_resolve_target_urls",
+        lambda spec, munis: [("http://fake-ibge/dados.zip", "*.csv", "RJ", resource)],
+    )
+    monkeypatch.setattr(census_ftp, "_download_zip_ftp", lambda url: zip_path)
+
+    df = census_ftp.fetch_census_ftp(spec, munis=[3304557])
+
+    assert df["renda_media"].dtype == "float64"
+    assert df["renda_media"].tolist() == [1000.5, 2000.0]
+    assert pd.isna(df["populacao"].iloc[0])
+    assert df["populacao"].iloc[1] == 10.5
@@ -0,0 +1,205 @@
+import os
+import time
+
+import pytest
+import pandas as pd
+import geopandas as gpd
+from shapely.geometry import Point
+
+from atlasbr.infra.storage import cache
+
+
+def test_parquet_cache_round_trip(tmp_cache_dir):
+    path = tmp_cache_dir / "sub" / "table.parquet"
+    df = pd.DataFrame({"code": [3304557, 3303302], "name": ["Rio", "Niterói"]})
+
+    assert cache.load_parquet_cache(path) is None
+    cache.save_parquet_cache(df, path)
+
+    pd.testing.assert_frame_equal(cache.load_parquet_cache(path), df)
+    assert not path.with_name(path.name + ".tmp").exists()
+
+    # Unreadable entries are treated as missing, never raised
+    path.write_bytes(b"not parquet")
+    assert cache.load_parquet_cache(path) is None
+
+
+def test_parquet_cache_expires(tmp_cache_dir):
+    path = tmp_cache_dir / "lookup.parquet"
+    cache.save_parquet_cache(pd.DataFrame({"a": [1]}), path)
+
+    assert cache.load_parquet_cache(path, max_age_days=30) is not None
+
+    # Back-date the entry past the limit
+    old = time.time() - 31 * 86400
+    os.utime(path, (old, old))
+    assert cache.load_parquet_cache(path, max_age_days=30) is None
+    assert cache.load_parquet_cache(path) is not None  # no limit: kept
+
+
+def test_arrow_cache_projection_keeps_geometry(tmp_cache_dir):
+    path = tmp_cache_dir / "tracts.parquet"
+    gdf = gpd.GeoDataFrame(
+        {"code_tract": [1, 2], "code_muni": [3304557, 3304557]},
+        geometry=[Point(0, 0), Point(1, 1)],
+        crs="EPSG:4674",
+    )
+    cache.save_parquet_cache(gdf, path)
+
+    table = cache.load_arrow_cache(path, columns=["code_tract", "absent"])
+
+    # Only the requested columns are read, plus the GeoParquet geometry
+    assert table.column_names == ["code_tract", "geometry"]
+    assert cache.load_arrow_cache(path).num_columns == 3
+    assert cache.load_arrow_cache(tmp_cache_dir / "missing.parquet") is None
+
+
+def _counting_query(result: pd.DataFrame):
+    calls = []
+
+    def run():
+        calls.append(1)
+        return result.copy()
+    return run, calls
+
+
+def test_cached_query_reuses_disk_results(tmp_cache_dir, monkeypatch):
+    monkeypatch.setattr(cache, "_QUERY_MEMO", cache.OrderedDict())
+    df = pd.DataFrame({"id_municipio": ["3304557"], "jobs": [10]})
+    run, calls = _counting_query(df)
+
+    first = cache.cached_query("SELECT *\n  FROM t WHERE ano = 2021", run)
+    cache._QUERY_MEMO.clear()  # force the Parquet read
+    # Whitespace differences map to the same entry
+    second = cache.cached_query("SELECT * FROM t WHERE ano = 2021", run)
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, df)
+    pd.testing.assert_frame_equal(second, df)
+    assert len(list((tmp_cache_dir / "queries").glob("*.parquet"))) == 1
+
+    # A different query runs again
+    cache.cached_query("SELECT * FROM t WHERE ano = 2022", run)
+    assert len(calls) == 2
+
+
+def test_cached_query_failure_stores_nothing(tmp_cache_dir, monkeypatch):
+    monkeypatch.setattr(cache, "_QUERY_MEMO", cache.OrderedDict())
+
+    def fail():
+        raise RuntimeError("quota exceeded")
+
+    with pytest.raises(RuntimeError):
+        cache.cached_query("SELECT 1", fail)
+    assert not (tmp_cache_dir / "queries").exists() or not any(
+        (tmp_cache_dir / "queries").iterdir()
+    )
+    assert not cache._QUERY_MEMO
+
+
+def test_cached_query_memo(tmp_cache_dir, monkeypatch):
+    monkeypatch.setattr(cache, "_QUERY_MEMO", cache.OrderedDict())
+    monkeypatch.setattr(cache, "QUERY_MEMO_MAXSIZE", 2)
+    run, calls = _counting_query(pd.DataFrame({"jobs": [10, 20]}))
+
+    first = cache.cached_query("SELECT a", run)
+    first.loc[0, "jobs"] = -1  # callers get their own copy
+
+    # Memo hit: neither the fetch nor the Parquet entry is needed
+    for entry in (tmp_cache_dir / "queries").iterdir():
+        entry.unlink()
+    assert cache.cached_query("SELECT a", run)["jobs"].tolist() == [10, 20]
+    assert len(calls) == 1
+
+    # Least recently used entries are evicted beyond the size limit
+    cache.cached_query("SELECT b", run)
+    cache.cached_query("SELECT c", run)
+    assert len(cache._QUERY_MEMO) == 2
+    cache.cached_query("SELECT a", run)
+    assert len(calls) == 4
+
+    # Expired entries fall back to disk / the fetch
+    monkeypatch.setattr(cache, "QUERY_MEMO_TTL_SECONDS", -1)
+    for entry in (tmp_cache_dir / "queries").iterdir():
+        entry.unlink()
+    cache.cached_query("SELECT c", run)
+    assert len(calls) == 5
+
+
+def test_cached_query_force_and_modes(tmp_cache_dir, monkeypatch):
+    from atlasbr import settings
+    monkeypatch.setattr(cache, "_QUERY_MEMO", cache.OrderedDict())
+    monkeypatch.setattr(settings._get_settings(), "query_cache", "on")
+    results = iter([pd.DataFrame({"jobs": [n]}) for n in range(1, 6)])
+
+    def run():
+        return next(results)
+
+    assert cache.cached_query("SELECT a", run)["jobs"].tolist() == [1]
+    assert cache.cached_query("SELECT a", run)["jobs"].tolist() == [1]
+
+    # force re-runs and overwrites both the memo and the Parquet entry
+    assert cache.cached_query("SELECT a", run, force=True)["jobs"].tolist() == [2]
+    cache._QUERY_MEMO.clear()
+    assert cache.cached_query("SELECT a", run)["jobs"].tolist() == [2]
+
+    # 'off' bypasses the cache; 'refresh' re-runs like force
+    settings.set_query_cache("off")
+    assert cache.cached_query("SELECT a", run)["jobs"].tolist() == [3]
+    settings.set_query_cache("refresh")
+    assert cache.cached_query("SELECT a", run)["jobs"].tolist() == [4]
+    settings.set_query_cache("on")
+    assert cache.cached_query("SELECT a", run)["jobs"].tolist() == [4]
+
+    with pytest.raises(ValueError, match="query cache mode"):
+        settings.set_query_cache("sometimes")
+
+
+def test_cached_query_does_not_store_empty_results(tmp_cache_dir, monkeypatch):
+    monkeypatch.setattr(cache, "_QUERY_MEMO", cache.OrderedDict())
+    run, calls = _counting_query(pd.DataFrame({"jobs": pd.Series([], dtype=int)}))
+
+    assert cache.cached_query("SELECT a", run).empty
+    assert cache.cached_query("SELECT a", run).empty
+
+    assert len(calls) == 2
+    assert not cache._QUERY_MEMO
+    assert not list((tmp_cache_dir / "queries").glob("*.parquet"))
+
+
+def test_cached_query_memo_byte_budget(tmp_cache_dir, monkeypatch):
+    from atlasbr import settings
+    monkeypatch.setattr(cache, "_QUERY_MEMO", cache.OrderedDict())
+    small = pd.DataFrame({"jobs": range(1000)})
+    nbytes = int(small.memory_usage(deep=True).sum())
+
+    # Room for 8 small results; anything above 2 of them is never kept
+    monkeypatch.setattr(
+        settings._get_settings(), "query_memo_mb", 8 * nbytes / 2**20
+    )
+    for n in range(9):
+        cache.cached_query(f"SELECT {n}", lambda: small)
+    assert len(cache._QUERY_MEMO) == 8  # oldest evicted by bytes
+
+    large = pd.DataFrame({"jobs": range(10_000)})
+    out = cache.cached_query("SELECT large", lambda: large)
+    assert len(cache._QUERY_MEMO) == 8
+    assert out is large  # not memoized, so not copied either
+
+    # A budget of 0 turns the memo off
+    settings.set_query_memo(0)
+    cache._QUERY_MEMO.clear()
+    cache.cached_query("SELECT 0", lambda: small)
+    assert not cache._QUERY_MEMO
+
+
+def test_path_locks_are_shared_while_held_and_then_dropped(tmp_path):
+    path = tmp_path / "a.zip"
+
+    lock = cache._lock_for(path)
+    assert cache._lock_for(path) is lock  # same entry while referenced
+    with lock:
+        assert cache._lock_for(path).locked()
+
+    del lock
+    assert path not in cache._PATH_LOCKS
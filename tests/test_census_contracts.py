@@ -43,4 +43,13 @@ def test_load_census_ftp_strategy(mock_tracts_gdf, mock_urban_gdf, mock_census_d
         )
         
         assert isinstance(gdf, gpd.GeoDataFrame)
-        assert not gdf.empty
\ No newline at end of file
+        assert not gdf.empty
+
+def test_census_catalog_rejects_duplicate_keys():
+    from atlasbr.core.catalog.census import CENSUS_CATALOG, _build_index
+
+    index = _build_index(CENSUS_CATALOG)
+    assert len(index) == len(CENSUS_CATALOG)
+
+    with pytest.raises(ValueError, match="Duplicate Census catalog entry"):
+        _build_index(CENSUS_CATALOG + (CENSUS_CATALOG[0],))
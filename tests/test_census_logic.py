@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+from atlasbr.core.logic.census import (
+    CENSO_RACES,
+    normalize_tract_ids,
+    standardize_census_dataframe,
+)
+
+
+def _race_2022_raw(rows):
+    """Raw BD race frame: (tract, pessoas, pop 15+, 15+ counts per race)."""
+    columns = (
+        ["pessoas"]
+        + [f"V{c:05d}" for c in range(644, 657)]
+        + [f"V{c:05d}" for c in range(657, 717)]
+    )
+    df = pd.DataFrame(0.0, index=[r[0] for r in rows], columns=columns)
+    df.index = pd.Index(df.index, dtype="int64", name="id_setor_censitario")
+    for tract, pessoas, adults, races in rows:
+        df.loc[tract, "pessoas"] = pessoas
+        df.loc[tract, "V00644"] = adults
+        # First age bracket of each race: V00657 + race offset
+        for i, count in enumerate(races):
+            df.loc[tract, f"V{657 + i:05d}"] = count
+    return df
+
+
+def test_race_2022_imputes_children_with_muni_shares():
+    raw = _race_2022_raw([
+        # Muni 3304557: adult shares 40% branca / 60% preta
+        (330455705000001, 20, 10, [6, 4, 0, 0, 0]),
+        (330455705000002, 15, 10, [2, 8, 0, 0, 0]),
+        # Muni 3303302: no 15+ population, so no shares (ratio 0, not inf)
+        (330330205000001, 5, 0, [3, 0, 0, 0, 0]),
+    ])
+
+    out = standardize_census_dataframe(raw, "race", 2022, "bd_table")
+
+    assert list(out.columns) == [f"cor_{r}" for r in CENSO_RACES]
+    assert out.index.equals(raw.index)
+    np.testing.assert_allclose(
+        out.to_numpy(),
+        [
+            [6 + 10 * 0.4, 4 + 10 * 0.6, 0, 0, 0],
+            [2 + 5 * 0.4, 8 + 5 * 0.6, 0, 0, 0],
+            [3, 0, 0, 0, 0],
+        ],
+    )
+
+
+def test_normalize_tract_ids_accepts_str_float_and_int_codes():
+    expected = [330455705000001, 330455705000002]
+    inputs = [
+        pd.Series(["330455705000001", " 330455705000002 "]),
+        pd.Series(["330455705000001", "330455705000002"], dtype=object),
+        pd.Series(["330455705000001.0", "330455705000002"]),
+        pd.Series([330455705000001.0, 330455705000002.0]),
+        pd.Series(expected, dtype="int64"),
+    ]
+    for ids in inputs:
+        ids.index = [10, 20]
+        out = normalize_tract_ids(ids.rename("id_setor_censitario"))
+        assert out.dtype == "int64"
+        assert out.tolist() == expected
+        assert out.index.tolist() == [10, 20]
+        assert out.name == "id_setor_censitario"
+
+
+def test_normalize_tract_ids_drops_missing_and_malformed_codes():
+    inputs = [
+        pd.Series([330455705000001.0, np.nan, 330455705000003.0]),
+        pd.Series(["330455705000001", None, "330455705000003"], dtype=object),
+        pd.Series(["330455705000001", "abc", "330455705000003.0"]),
+        pd.Series([330455705000001, None, 330455705000003], dtype="Int64"),
+    ]
+    for ids in inputs:
+        out = normalize_tract_ids(ids)
+        assert out.dtype == "int64"
+        assert out.tolist() == [330455705000001, 330455705000003]
+        assert out.index.tolist() == [0, 2]
+
+
+def test_clipped_residual_keeps_nullable_dtypes():
+    from atlasbr.core.logic.census import clipped_residual
+
+    total = pd.Series([10, 5, None], dtype="Int64")
+    parts = [
+        pd.Series([3, 4, 1], dtype="Int64"),
+        pd.Series([2, None, 1], dtype="Int64"),
+        pd.Series([1, 3, 1], dtype="Int64"),
+    ]
+    out = clipped_residual(total, parts)
+
+    assert out.dtype == "Int64"
+    assert out.iloc[:2].tolist() == [4, 0]
+    assert out.isna().tolist() == [False, False, True]
+
+    # NumPy inputs still take the in-place path
+    plain = clipped_residual(
+        pd.Series([10.0, np.nan]), [pd.Series([3.0, 1.0]), pd.Series([np.nan, 1.0])]
+    )
+    assert plain.dtype == "float64"
+    assert plain.iloc[0] == 7.0 and np.isnan(plain.iloc[1])
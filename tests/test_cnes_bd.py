@@ -0,0 +1,46 @@
+import sys
+import types
+
+import pandas as pd
+import pytest
+
+from atlasbr.core.catalog.cnes import CNES_INFRASTRUCTURE_GROUPS
+from atlasbr.infra.adapters import cnes_bd
+
+
+def _fetch(monkeypatch, raw):
+    fake_bd = types.SimpleNamespace(read_sql=lambda query, **kwargs: raw.copy())
+    monkeypatch.setitem(sys.modules, "basedosdados", fake_bd)
+    monkeypatch.setattr(cnes_bd, "cached_query", lambda query, load: load())
+    return cnes_bd.fetch_cnes_from_bd(
+        [3304557], 2023, 12, "estab_table", "prof_table"
+    )
+
+
+def _raw_counts(infra, workers):
+    return pd.DataFrame({
+        "id_estabelecimento_cnes": ["0000001", "0000002"],
+        **{
+            col: pd.array(infra, dtype="Int64")
+            for col in CNES_INFRASTRUCTURE_GROUPS
+        },
+        "quantidade_trabalhadores_saude": pd.array(workers, dtype="Int64"),
+    })
+
+
+def test_fetch_cnes_from_bd_stores_counts_with_fixed_widths(monkeypatch):
+    df = _fetch(monkeypatch, _raw_counts([0, 100], [3, 40000]))
+
+    for col in CNES_INFRASTRUCTURE_GROUPS:
+        assert df[col].dtype == "int16", col
+    assert df["quantidade_trabalhadores_saude"].dtype == "int32"
+    # Large hospital complexes keep their headcount instead of wrapping
+    assert df["quantidade_trabalhadores_saude"].tolist() == [3, 40000]
+
+    first = next(iter(CNES_INFRASTRUCTURE_GROUPS))
+    assert (df[first] + df[first]).tolist() == [0, 200]
+
+
+def test_fetch_cnes_from_bd_rejects_counts_that_would_wrap(monkeypatch):
+    with pytest.raises(ValueError, match="int16"):
+        _fetch(monkeypatch, _raw_counts([0, 40000], [3, 4]))
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from atlasbr.infra.adapters.dtypes import ARROW_STRING, to_arrow_strings
+
+
+def test_to_arrow_strings_converts_only_string_columns():
+    df = pd.DataFrame({
+        "id": pd.Series(["001", "002", None], dtype=object),
+        "mixed": pd.Series(["a", 1, None], dtype=object),
+        "value": [1.0, 2.0, np.nan],
+    })
+    out = to_arrow_strings(df)
+
+    assert out is df
+    assert df["id"].dtype == ARROW_STRING
+    assert df["id"].tolist()[:2] == ["001", "002"]
+    assert pd.isna(df.loc[2, "id"])
+    assert df["mixed"].dtype == object
+    assert df["value"].dtype == "float64"
+
+
+def test_to_arrow_strings_restricts_to_given_columns():
+    df = pd.DataFrame({
+        "a": pd.Series(["x"], dtype=object),
+        "b": pd.Series(["y"], dtype=object),
+    })
+    to_arrow_strings(df, columns=["b", "missing"])
+
+    assert df["a"].dtype == object
+    assert df["b"].dtype == ARROW_STRING
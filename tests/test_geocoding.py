@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+
+from atlasbr.core.logic.geocoding import geocode_by_cep
+
+
+def _cep_reference():
+    return pd.DataFrame({
+        "cep": ["24020005", "24020005", "01001000"],
+        "centroide": ["POINT (1 1)", "POINT (2 2)", "POINT (3 3)"],
+    })
+
+
+def test_geocode_by_cep_contract():
+    """Row count, index and data columns are kept; keys are normalized."""
+    data = pd.DataFrame(
+        {
+            "x": [1, 2, 3, 4, 5, 6],
+            "cep": ["24020-005", "24020005.0", "1001000", "", None, "99999999"],
+        },
+        index=pd.Index([10, 11, 12, 13, 14, 15], name="row"),
+    )
+
+    gdf = geocode_by_cep(data, _cep_reference())
+
+    assert isinstance(gdf, gpd.GeoDataFrame)
+    assert gdf.crs == "EPSG:4326"
+    # No merge: one output row per input row, index preserved
+    assert gdf.index.equals(data.index)
+    assert list(gdf.columns) == ["x", "cep", "geometry"]
+    assert gdf["cep"].tolist() == data["cep"].tolist()
+
+    coords = [None if g is None else (g.x, g.y) for g in gdf.geometry]
+    # Dashed, float-like and unpadded CEPs match; a duplicated reference
+    # CEP keeps its first centroid; empty, None and unknown get no geometry
+    assert coords == [(1, 1), (1, 1), (3, 3), None, None, None]
+
+
+def test_geocode_by_cep_numeric_keys():
+    """Numeric CEP columns (float with NaN) match the string reference."""
+    data = pd.DataFrame({"cep": [24020005.0, np.nan, 1001000.0]})
+
+    gdf = geocode_by_cep(data, _cep_reference())
+
+    assert gdf.geometry.isna().tolist() == [False, True, False]
+    point = gdf.geometry.iloc[2]
+    assert (point.x, point.y) == (3, 3)
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+import shapely
+import geopandas as gpd
+from shapely.geometry import box
+
+from atlasbr.core.geo import h3 as h3_ops
+
+CRS = "EPSG:31983"
+
+
+def _grid(n: int, size: float, offset: float = 0.0):
+    """n x n grid of square cells."""
+    return [
+        box(offset + i * size, offset + j * size,
+            offset + (i + 1) * size, offset + (j + 1) * size)
+        for i in range(n) for j in range(n)
+    ]
+
+
+def _brute_force(source, target, ext, intv, preserve_totals):
+    """Reference result from pairwise overlay areas."""
+    src = np.asarray(source.geometry.array)
+    tgt = np.asarray(target.geometry.array)
+    areas = shapely.area(shapely.intersection(src[:, None], tgt[None, :]))
+
+    if preserve_totals:
+        den = areas.sum(axis=1)
+    else:
+        den = shapely.area(src)
+    den = np.where(den == 0, 1.0, den)
+    ext_values = (source[ext].to_numpy(float) / den[:, None]).T @ areas
+
+    covered = areas.sum(axis=0)
+    int_values = source[intv].to_numpy(float).T @ areas
+    int_values = int_values / np.where(covered == 0, 1.0, covered)
+    return ext_values.T, int_values.T
+
+
+def _frames(n_src: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    side = int(np.ceil(np.sqrt(n_src)))
+    source = gpd.GeoDataFrame(
+        {
+            "pop": rng.integers(0, 500, side * side).astype(float),
+            "income": rng.uniform(500, 5000, side * side),
+        },
+        geometry=_grid(side, 10.0),
+        crs=CRS,
+    )
+    # Shifted, coarser target grid; the last cell lies outside the sources
+    targets = _grid(4, side * 10.0 / 4, offset=3.0) + [box(1e4, 1e4, 1e4 + 5, 1e4 + 5)]
+    target = gpd.GeoDataFrame(geometry=targets, crs=CRS)
+    return source, target
+
+
+@pytest.mark.parametrize("preserve_totals", [True, False])
+def test_interpolate_matches_brute_force(preserve_totals):
+    source, target = _frames(36)
+
+    out = h3_ops.interpolate_area_weighted(
+        source, target,
+        extensive_vars=["pop"], intensive_vars=["income"],
+        preserve_totals=preserve_totals,
+    )
+    ext, intv = _brute_force(source, target, ["pop"], ["income"], preserve_totals)
+
+    assert out.index.equals(target.index)
+    np.testing.assert_allclose(out["pop"].to_numpy(), ext[:, 0])
+    np.testing.assert_allclose(out["income"].to_numpy(), intv[:, 0])
+    # The target with no overlap gets zeros, not NaN/inf
+    assert out.iloc[-1][["pop", "income"]].tolist() == [0.0, 0.0]
+    if preserve_totals:
+        assert out["pop"].sum() == pytest.approx(source["pop"].sum())
+
+
+def test_overlap_matrix_chunked_path(monkeypatch):
+    """Source chunks on worker threads build the same matrix."""
+    source, target = _frames(49, seed=1)
+    single = h3_ops.area_overlap_matrix(source, target).toarray()
+
+    monkeypatch.setattr(h3_ops, "OVERLAP_CHUNK_SIZE", 5)
+    chunked = h3_ops.area_overlap_matrix(source, target)
+
+    np.testing.assert_allclose(chunked.toarray(), single)
+    out = h3_ops.interpolate_area_weighted(
+        source, target, extensive_vars=["pop"], intensive_vars=["income"]
+    )
+    ext, intv = _brute_force(source, target, ["pop"], ["income"], True)
+    np.testing.assert_allclose(out["pop"].to_numpy(), ext[:, 0])
+    np.testing.assert_allclose(out["income"].to_numpy(), intv[:, 0])
+
+
+def test_interpolate_rejects_mismatched_overlap():
+    source, target = _frames(9)
+    overlap = h3_ops.area_overlap_matrix(source, target.iloc[:-1])
+    with pytest.raises(ValueError):
+        h3_ops.interpolate_area_weighted(
+            source, target, extensive_vars=["pop"], overlap=overlap
+        )
@@ -7,7 +7,7 @@ def test_atlasbr_imports_without_optional_deps():
     Ensure core atlasbr modules import even if 'basedosdados', 'plotly', etc. are missing.
     """
     # List of modules to simulate as missing
-    missing_modules = ["basedosdados", "plotly", "mapclassify", "tobler", "h3", "geobr"]
+    missing_modules = ["basedosdados", "plotly", "mapclassify", "tobler", "scipy", "h3", "geobr"]
     
     with patch.dict(sys.modules, {m: None for m in missing_modules}):
         # Force reload of atlasbr to test import logic in a clean environment
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from atlasbr.core.logic.integration import conform_to_schema
+
+
+def test_conform_to_schema_casts_lossless_columns():
+    """Nullable ints, NumPy ints and strings take the RAIS dtypes."""
+    rais = pd.DataFrame({
+        "quantidade_vinculos_ativos": pd.array([10, None], dtype="Int64"),
+        "porte": np.array([1, 2], dtype=np.int64),
+        "cnae_2": pd.array(["8513900", "8610101"], dtype=str),
+    })
+    injected = pd.DataFrame({
+        "quantidade_vinculos_ativos": pd.array([3, None], dtype="Int16"),
+        "porte": np.array([1, 1], dtype=np.int16),
+        "cnae_2": pd.Series(["8513900", None], dtype=object),
+        "id_estab_original": ["a", "b"],
+    })
+    columns = [*rais.columns, "id_estab_original"]
+
+    out = conform_to_schema(injected, columns, rais.dtypes)
+
+    assert list(out.columns) == columns
+    assert out["quantidade_vinculos_ativos"].dtype == "Int64"
+    assert out["porte"].dtype == np.int64
+    assert pd.api.types.is_string_dtype(out["cnae_2"].dtype)
+    assert out["quantidade_vinculos_ativos"].isna().tolist() == [False, True]
+    # Concat now stacks matching dtypes
+    merged = pd.concat([rais, out], ignore_index=True)
+    assert merged["quantidade_vinculos_ativos"].dtype == "Int64"
+
+
+def test_conform_to_schema_leaves_lossy_columns():
+    """Casts that would change values are skipped."""
+    schema = pd.Series({"jobs": np.dtype(np.int8), "cep": np.dtype(np.int64)})
+    df = pd.DataFrame({
+        "jobs": np.array([300, 5], dtype=np.int64),
+        "cep": pd.Series(["20000-000", "x"], dtype=object),
+    })
+
+    out = conform_to_schema(df, ["jobs", "cep"], schema)
+
+    assert out["jobs"].dtype == np.int64
+    assert out["cep"].tolist() == ["20000-000", "x"]
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+import shapely
+import geopandas as gpd
+from shapely.geometry import Point, LineString, Polygon, box
+
+from atlasbr.core.geo import masks, ops
+
+CRS = "EPSG:31983"
+
+# Single dissolved polygon (fast path) and a two-part mask (pairwise path)
+MASKS = {
+    "single": [box(0, 0, 10, 10)],
+    "multi": [box(0, 0, 10, 10), box(10, 0, 20, 10)],
+}
+
+GEOMETRIES = {
+    "polygons": [
+        box(2, 2, 4, 4),                # inside
+        box(8, 8, 12, 12),              # crossing the boundary
+        box(-5, 0, 0, 10),              # shares an edge only
+        box(30, 30, 31, 31),            # outside
+        Polygon([(9, 1), (11, 1), (11, 3), (9, 3)]),  # spans both parts
+    ],
+    "lines": [
+        LineString([(1, 1), (3, 3)]),
+        LineString([(5, 5), (25, 5)]),
+        LineString([(-5, 5), (0, 5)]),  # touches at one point
+        LineString([(40, 40), (41, 41)]),
+    ],
+    "points": [
+        Point(5, 5),
+        Point(0, 5),                    # on the boundary
+        Point(10, 5),                   # on the internal seam
+        Point(50, 50),
+    ],
+}
+
+
+def _assert_same_clip(result: gpd.GeoDataFrame, expected: gpd.GeoDataFrame):
+    result, expected = result.sort_index(), expected.sort_index()
+    assert result.index.tolist() == expected.index.tolist()
+    assert result["value"].tolist() == expected["value"].tolist()
+    assert result.crs == expected.crs
+    assert shapely.equals(
+        np.asarray(result.geometry.array), np.asarray(expected.geometry.array)
+    ).all()
+
+
+@pytest.mark.parametrize("mask_kind", sorted(MASKS))
+@pytest.mark.parametrize("geom_kind", sorted(GEOMETRIES))
+def test_clip_to_mask_matches_gpd_clip(geom_kind, mask_kind):
+    geoms = GEOMETRIES[geom_kind]
+    gdf = gpd.GeoDataFrame(
+        {"value": np.arange(len(geoms))},
+        geometry=geoms,
+        index=np.arange(100, 100 + len(geoms)),
+        crs=CRS,
+    )
+    mask = gpd.GeoDataFrame(geometry=MASKS[mask_kind], crs=CRS)
+    expected = gpd.clip(gdf, mask, keep_geom_type=True)
+
+    _assert_same_clip(masks.clip_to_mask(gdf, mask), expected)
+    _assert_same_clip(ops.clip_to_mask(gdf, mask), expected)
+
+
+def test_clip_to_mask_chunked_path(monkeypatch):
+    """The threaded chunk path returns the same rows as gpd.clip."""
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(-5, 25, 60), rng.uniform(-5, 15, 60)
+    gdf = gpd.GeoDataFrame(
+        {"value": np.arange(60)},
+        geometry=shapely.buffer(shapely.points(x, y), 1.5),
+        crs=CRS,
+    )
+    mask = gpd.GeoDataFrame(geometry=MASKS["single"], crs=CRS)
+    monkeypatch.setattr(ops, "CLIP_CHUNK_SIZE", 7)
+
+    _assert_same_clip(
+        ops.clip_to_mask(gdf, mask), gpd.clip(gdf, mask, keep_geom_type=True)
+    )
+
+
+def test_clip_to_mask_empty_results():
+    gdf = gpd.GeoDataFrame(
+        {"value": [1, 2]}, geometry=[box(30, 30, 31, 31), Point(50, 50)], crs=CRS
+    )
+    mask = gpd.GeoDataFrame(geometry=MASKS["single"], crs=CRS)
+
+    out = masks.clip_to_mask(gdf, mask)
+    assert out.empty
+    assert list(out.columns) == list(gdf.columns)
+
+    # An empty mask keeps nothing
+    empty_mask = gpd.GeoDataFrame(geometry=[], crs=CRS)
+    assert ops.clip_to_mask(gdf, empty_mask).empty
+
+
+def test_prepare_tracts_skips_rows_without_a_tract_code():
+    raw = gpd.GeoDataFrame(
+        {"code_tract": [330455705000001.0, np.nan, 330455705000003.0]},
+        geometry=[
+            box(-43.2 + i * 0.01, -22.9, -43.19 + i * 0.01, -22.89)
+            for i in range(3)
+        ],
+        crs="EPSG:4674",
+    )
+
+    out = ops.prepare_tracts(raw)
+
+    assert out.index.tolist() == [330455705000001, 330455705000003]
+    assert out.index.dtype == "int64"
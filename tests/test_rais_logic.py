@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from atlasbr.core.catalog.rais import CNAE_PROBLEM_PREFIXES
+from atlasbr.core.logic import rais as rais_logic
+
+
+def _reference_clip(df: pd.DataFrame, jobs_col: str) -> pd.Series:
+    """groupby().quantile(0.95) per 3-digit prefix of the problematic rows."""
+    codes = df["cnae_2"].astype(str)
+    problematic = codes.str.startswith(tuple(CNAE_PROBLEM_PREFIXES))
+    prefix = codes.str[:3]
+    p95 = prefix.map(df[problematic].groupby(prefix[problematic])[jobs_col].quantile(0.95))
+    clip = problematic & (df[jobs_col] > p95)
+    return df[jobs_col].where(~clip, p95.round())
+
+
+def test_clip_outlier_jobs_matches_groupby_quantile():
+    rng = np.random.default_rng(0)
+    n = 2_000
+    prefixes = rng.choice(["812", "811", "562", "491", "620", "100"], n)
+    df = pd.DataFrame({
+        "cnae_2": [f"{p}{s:04d}" for p, s in zip(prefixes, rng.integers(0, 9999, n))],
+        "quantidade_vinculos_ativos": rng.integers(0, 1_000, n),
+    })
+    df.loc[::97, "quantidade_vinculos_ativos"] = 50_000  # outliers
+
+    out = rais_logic.clip_outlier_jobs(df)
+
+    expected = _reference_clip(df, "quantidade_vinculos_ativos")
+    np.testing.assert_array_equal(
+        out["quantidade_vinculos_ativos"].to_numpy(), expected.to_numpy()
+    )
+    # Non-problematic sectors (62x, 10x) are never clipped
+    safe = df["cnae_2"].str[:2].isin(["62", "10"])
+    assert out.loc[safe, "quantidade_vinculos_ativos"].max() == 50_000
+    # The input frame is left untouched
+    assert df["quantidade_vinculos_ativos"].max() == 50_000
+
+
+def test_clip_outlier_jobs_without_problematic_rows():
+    df = pd.DataFrame({"cnae_2": ["6201501"], "quantidade_vinculos_ativos": [10]})
+    assert rais_logic.clip_outlier_jobs(df) is df
+
+
+def test_enrich_cnae_metadata_sections():
+    """Integer-prefix LUT matches the zero-padded 2-digit prefix lookup."""
+    df = pd.DataFrame({
+        "cnae_2": ["0111301", "111301", 4120400, "8513900", None, "abc", "9999999"]
+    })
+
+    out = rais_logic.enrich_cnae_metadata(df)
+
+    # '111301' is 7-digit '0111301' without its leading zero (section A)
+    assert out["cnae_section"].tolist()[:4] == ["A", "A", "F", "P"]
+    assert out["cnae_section"].iloc[4:6].isna().all()
+    assert out["cnae_sector"].iloc[2] == "Construção"
+    assert out["cnae_sector"].iloc[4:6].isna().all()
+
+
+def test_filter_invalid_legal_nature_numeric_and_string_codes():
+    """Public administration ('1xxx') and '2011' are dropped either way."""
+    codes = [1015, 1236, 2011, 2062, 2135, 3999]
+    keep = [2062, 2135, 3999]
+
+    numeric = pd.DataFrame({"natureza_juridica": codes})
+    text = pd.DataFrame({"natureza_juridica": [str(c) for c in codes]})
+
+    assert rais_logic.filter_invalid_legal_nature(numeric)["natureza_juridica"].tolist() == keep
+    assert rais_logic.filter_invalid_legal_nature(text)["natureza_juridica"].tolist() == [
+        str(c) for c in keep
+    ]
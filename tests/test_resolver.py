@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from atlasbr.infra.geo import resolver
+
+
+@pytest.fixture
+def muni_lookup():
+    """Small geobr-like lookup table; memoized indexes are reset around it."""
+    df = pd.DataFrame({
+        "code_muni": [3304557, 3303302, 3550308, 3303302],
+        "name_muni": ["Rio de Janeiro", "Niterói", "São Paulo", "Niterói"],
+        "abbrev_state": ["RJ", "RJ", "SP", "RJ"],
+    })
+    df["norm_name"] = resolver._normalize_column(df["name_muni"])
+    df["norm_uf"] = resolver._normalize_column(df["abbrev_state"])
+
+    resolver._muni_indexes.cache_clear()
+    resolver._resolve_places_cached.cache_clear()
+    with patch.object(resolver, "_fetch_muni_metadata", return_value=df) as fetch:
+        yield fetch
+    resolver._muni_indexes.cache_clear()
+    resolver._resolve_places_cached.cache_clear()
+
+
+def test_codes_resolve_without_lookup(muni_lookup):
+    """Numeric inputs skip geobr; duplicates collapse in input order."""
+    ids = resolver.resolve_places_to_ids([3304557, "3303302", 3304557.0, " 3550308 "])
+
+    assert ids == [3304557, 3303302, 3550308]
+    muni_lookup.assert_not_called()
+
+
+def test_names_resolve_through_indexes(muni_lookup):
+    ids = resolver.resolve_places_to_ids(
+        ["niteroi, rj", ("São Paulo", "SP"), "RIO DE JANEIRO, RJ", 3303302]
+    )
+
+    assert ids == [3303302, 3550308, 3304557]
+    # Unhashable inputs bypass the memo and still get the format error
+    with pytest.raises(ValueError, match="Invalid place format"):
+        resolver.resolve_places_to_ids([["Niterói", "RJ"]])
+
+
+def test_resolution_is_memoized(muni_lookup):
+    places = ["Niterói, RJ", 3304557]
+    first = resolver.resolve_places_to_ids(places)
+    first.append(0)  # callers get their own list
+
+    assert resolver.resolve_places_to_ids(places) == [3303302, 3304557]
+    assert resolver._resolve_places_cached.cache_info().hits == 1
+    assert muni_lookup.call_count == 1
+
+
+def test_unknown_name_suggests_matches(muni_lookup):
+    with pytest.raises(ValueError, match="Did you mean"):
+        resolver.resolve_places_to_ids(["Niteroy, RJ"])
+    with pytest.raises(ValueError, match="Could not find state"):
+        resolver.resolve_places_to_ids(["Niterói, XX"])
@@ -0,0 +1,42 @@
+import pytest
+import pandas as pd
+import geopandas as gpd
+from shapely.geometry import Point
+
+pytest.importorskip("plotly")
+pytest.importorskip("mapclassify")
+
+from atlasbr.viz.utils import prepare_geodata, visibility_mask
+
+
+def test_prepare_geodata_keeps_first_geometry_per_id():
+    """One geometry per ID (its first row), IDs sorted as strings."""
+    gdf = gpd.GeoDataFrame(
+        {
+            "id": [3304557, 3303302, 3304557, 3303302, 3303302],
+            "year": [2022, 2022, 2010, 2010, 2022],
+            "pop": [1.0, 2.0, 3.0, 4.0, 5.0],
+        },
+        geometry=[Point(0, 0), Point(1, 1), Point(9, 9), Point(8, 8), None],
+        crs="EPSG:4326",
+    )
+
+    out, geojson, ids, years = prepare_geodata(gdf, "id", "year", ["pop", "missing"])
+
+    assert years == [2010, 2022]
+    assert ids == ["3303302", "3304557"]
+    assert [f["properties"]["id"] for f in geojson["features"]] == ids
+    coords = [f["geometry"]["coordinates"] for f in geojson["features"]]
+    assert coords == [(1.0, 1.0), (0.0, 0.0)]
+    assert list(out.columns) == ["year", "id", "geometry", "pop"]
+    assert len(out) == 4
+
+
+def test_visibility_mask_marks_one_trace():
+    """Traces are ordered var-major: var_0_year_0, var_0_year_1, ..."""
+    assert visibility_mask(2, 3, 1, 0) == [False, False, False, True, False, False]
+    for var_idx in range(2):
+        for year_idx in range(3):
+            mask = visibility_mask(2, 3, var_idx, year_idx)
+            assert mask.index(True) == var_idx * 3 + year_idx
+            assert mask.count(True) == 1